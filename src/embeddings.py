@@ -172,11 +172,15 @@ class EmbeddingService:
             with ThreadPoolExecutor(max_workers=workers) as pool:
                 future_to_idx = {pool.submit(self._embed_one_batch, b): i for i, b in enumerate(batches)}
                 done_count = 0
+                # Log roughly every 20% of batches
+                log_every = max(len(batches) // 5, 1)
+                next_log = log_every
                 for future in as_completed(future_to_idx):
                     idx = future_to_idx[future]
                     batch_results[idx] = future.result()
                     done_count += 1
-                    if show_progress and done_count % max(len(batches) // 5, 1) == 0:
+                    if show_progress and done_count >= next_log:
+                        next_log += log_every
                         done_texts = min(done_count * bs, total)
                         elapsed = time.time() - start
                         rate = done_texts / elapsed if elapsed > 0 else 0
@@ -3,16 +3,114 @@
 import hashlib
 import json
 import logging
+import multiprocessing
+import os
+import pickle  # nosec B403 - only loads the indexer's own cache file
+import sys
+import threading
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import TypedDict
+from typing import Any, TypedDict, cast
 
 import defusedxml.ElementTree as DefusedET
+from lxml import etree as lxml_etree
+from lxml import html as lxml_html
+
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+
+    def json_dumps_indented(obj: object) -> bytes:  # pragma: no cover
+        """Serialize obj as indented UTF-8 JSON (orjson fast path)."""
+        return cast(bytes, orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
+except ImportError:
+
+    def json_dumps_indented(obj: object) -> bytes:
+        """Serialize obj as indented UTF-8 JSON (stdlib fallback when orjson isn't installed)."""
+        return json.dumps(obj, indent=2).encode("utf-8")
+
 
 logger = logging.getLogger(__name__)
 
+# Bump when the pickled index cache layout (or HelpPage) changes
+_INDEX_CACHE_VERSION = 3
+
+# Element tags in brhelpcontent.xml (full and abbreviated forms).
+# Entry tags map to their is_section flag, so one dict lookup classifies an element
+_ENTRY_TAGS: dict[str, bool] = {"Section": True, "S": True, "Page": False, "P": False}
+IDENTIFIERS_TAGS = frozenset(("Identifiers", "I"))
+HELP_ID_TAGS = frozenset(("HelpID", "H"))
+
+# HTML text extraction: elements dropped entirely, and block-level tags that
+# get a separating space so words from adjacent blocks don't run together
+_DROP_XPATH = lxml_etree.XPath("descendant::script | descendant::style")
+_BLOCK_TAGS = frozenset(
+    ("p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "li", "td", "th", "tr", "table", "blockquote", "pre")
+)
+
+
+def _lxml_to_text(root) -> str:
+    """Extract whitespace-normalized plain text from a parsed lxml HTML tree.
+
+    Script and style elements are removed from the tree first.
+    """
+    # The XPath only matches elements, so narrow lxml's generic result type
+    for element in cast(list, _DROP_XPATH(root)):
+        element.getparent().remove(element)
+
+    # Prefix block-level tails with a space to preserve word boundaries,
+    # then let lxml collect the text nodes in C
+    for elem in root.iter(*_BLOCK_TAGS):
+        elem.tail = " " + elem.tail if elem.tail else " "
+
+    return " ".join(root.text_content().split())
+
+
+def _extract_help_id(help_id_elem: Any) -> str | None:
+    """Return the value of a <HelpID Value="..."> or abbreviated <H v="..."> element.
+
+    Empty values are treated as missing.
+    """
+    attrib = help_id_elem.attrib
+    return attrib.get("Value") or attrib.get("v") or None
+
+
+def _extract_plain_text_from_file(html_file: str) -> str | None:
+    """Read an HTML file and return its plain text.
+
+    Module-level so it can be pickled and run in worker processes.
+
+    Args:
+        html_file: Absolute path to the HTML file, or "" for pages without a file
+
+    Returns:
+        Plain text content, or None if the file is missing or extraction fails
+    """
+    if not html_file:
+        return None
+
+    try:
+        # Use lxml directly for maximum speed (bypasses BeautifulSoup overhead).
+        # Opening directly (EAFP) saves a separate stat() per file.
+        with open(html_file, "rb") as f:  # Read as bytes for lxml
+            tree = lxml_html.parse(f)
+
+        root = tree.getroot()
+        if root is None:
+            return None  # pragma: no cover
+
+        return _lxml_to_text(root) or None
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # pragma: no cover
+        logger.debug(f"Failed to extract text from {html_file}: {e}")  # pragma: no cover
+        return None  # pragma: no cover
+
 
 class SectionChild(TypedDict):
     """Type definition for section children."""
@@ -31,7 +129,7 @@ class Category(TypedDict):
     file_path: str
 
 
-@dataclass
+@dataclass(slots=True)
 class HelpPage:
     """Represents a help page or section."""
 
@@ -41,27 +139,81 @@ class HelpPage:
     help_id: str | None = None
     parent_id: str | None = None
     is_section: bool = False
+    sort_key: str = field(init=False, repr=False, compare=False)  # Lowercased title for navigation ordering
+
+    def __post_init__(self) -> None:
+        """Precompute the sort key once instead of on every navigation call."""
+        self.sort_key = self.text.lower()
+
+
+# Entries kept per content cache (plain text / HTML of recently retrieved pages)
+CONTENT_CACHE_SIZE = 256
+
+
+class _LRUCache:
+    """Small thread-safe LRU map for page content retrieved by the MCP tools.
+
+    Help files don't change while the server runs, so entries never go stale;
+    the size bound keeps memory flat across 58K+ pages.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[str, str | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], str | None]) -> str | None:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Compute outside the lock so slow reads don't serialize other lookups
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
 
 
 class HelpContentIndexer:
     """Indexes B&R Automation Studio help content with incremental update support."""
 
-    def __init__(self, help_root: Path, metadata_dir: Path | None = None):
+    def __init__(self, help_root: Path, metadata_dir: Path | None = None, trusted_xml: bool = True):
         """Initialize indexer with path to help root directory.
         Args:
             help_root: Path to directory containing brhelpcontent.xml and HTML files
             metadata_dir: Directory to store metadata (defaults to help_root/.ashelp_metadata)
+            trusted_xml: Parse brhelpcontent.xml with lxml (faster) instead of defusedxml.
+                The file comes from a local B&R help installation; entity expansion and
+                network access stay disabled either way.
         """
         self.help_root = Path(help_root)
+        self.trusted_xml = trusted_xml
         self.xml_path = self.help_root / "brhelpcontent.xml"
         self.metadata_dir = Path(metadata_dir) if metadata_dir else self.help_root / ".ashelp_metadata"
         self.metadata_path = self.metadata_dir / "index_metadata.json"
+        self.index_cache_path = self.metadata_dir / "index_cache.pkl"
 
         self.pages: dict[str, HelpPage] = {}
         self.help_id_map: dict[str, str] = {}  # Maps HelpID -> page ID
-        self._breadcrumb_cache: dict[str, list[HelpPage]] = {}  # Cache breadcrumbs to avoid recomputation
+        self._breadcrumb_cache: dict[str, tuple[HelpPage, ...]] = {}  # Cache breadcrumbs to avoid recomputation
+        self._breadcrumb_strings: dict[str, str] = {}  # Cached ' > ' joined form of each breadcrumb
         self._duplicate_ids: dict[str, list[str]] = {}  # Track duplicate IDs: id -> [first_title, second_title, ...]
-        self._dup_id_counter: dict[str, int] = {}  # Counter for generating unique synthetic IDs
+        self._children: dict[str | None, list[str]] = {}  # Maps parent ID (None for root) -> child IDs
+        self._hash_cache: tuple[int, int, str] | None = None  # (mtime_ns, size, hash) of the last hashed XML
+        self._text_cache = _LRUCache(CONTENT_CACHE_SIZE)  # Recently retrieved plain text, by page ID
+        self._html_cache = _LRUCache(CONTENT_CACHE_SIZE)  # Recently retrieved HTML, by page ID
+        self._structure_stats: dict[str, int] = {}  # Page/section counts, filled once pages are loaded
 
         # Ensure directories exist
         self.help_root.mkdir(parents=True, exist_ok=True)
@@ -74,51 +226,82 @@ class HelpContentIndexer:
             )  # pragma: no cover
 
     def _get_xml_hash(self) -> str:
-        """Calculate MD5 hash of brhelpcontent.xml for change detection."""
-        return hashlib.md5(self.xml_path.read_bytes(), usedforsecurity=False).hexdigest()
+        """Calculate BLAKE2b hash of brhelpcontent.xml for change detection.
+
+        The file is streamed in 1 MiB chunks so large help XML files are never
+        loaded into memory at once. The 16-byte digest keeps the 32-char hex
+        format of the previous MD5 hash; stored MD5 values simply stop matching,
+        which triggers a single reindex after upgrading.
+
+        The result is memoized against the file's (mtime_ns, size), so the
+        indexer and search engine can ask repeatedly during startup without
+        re-reading the file.
+        """
+        stat = self.xml_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._hash_cache is not None and self._hash_cache[:2] == key:
+            return self._hash_cache[2]
+
+        h = hashlib.blake2b(digest_size=16)
+        with self.xml_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self._hash_cache = (*key, digest)
+        return digest
 
     def get_page_fingerprints(self) -> dict[str, str]:
         """Compute a fingerprint for each page from its XML metadata.
 
         The fingerprint is a short hash of (title, file_path, parent_id, help_id,
-        is_section).  Two fingerprints differ whenever B&R regenerates a page's
-        entry in brhelpcontent.xml, which reliably signals that the page content
-        changed as well.
+        is_section, breadcrumb path).  Two fingerprints differ whenever B&R
+        regenerates a page's entry in brhelpcontent.xml, which reliably signals
+        that the page content changed as well.  The breadcrumb path makes a
+        renamed ancestor re-index its descendants, whose stored breadcrumb and
+        category would otherwise go stale in an incremental update.
 
         Returns:
             Dict mapping page_id -> hex fingerprint string.
         """
         fingerprints: dict[str, str] = {}
         for page_id, page in self.pages.items():
-            key = f"{page.text}|{page.file_path}|{page.parent_id}|{page.help_id}|{page.is_section}"
+            breadcrumb = self.get_breadcrumb_string(page_id)
+            key = f"{page.text}|{page.file_path}|{page.parent_id}|{page.help_id}|{page.is_section}|{breadcrumb}"
             fingerprints[page_id] = hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
         return fingerprints
 
     def _load_metadata(self) -> dict[str, str | int] | None:
         """Load index metadata if it exists."""
-        if self.metadata_path.exists():
-            try:
-                data = json.loads(self.metadata_path.read_text(encoding="utf-8"))
-                return data if isinstance(data, dict) else None
-            except Exception as e:  # pragma: no cover
-                logger.warning(f"Failed to load metadata: {e}")  # pragma: no cover
-        return None
+        try:
+            data = json.loads(self.metadata_path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # pragma: no cover
+            logger.warning(f"Failed to load metadata: {e}")  # pragma: no cover
+        return None  # pragma: no cover
 
     def _save_metadata(self):
         """Save index metadata."""
+        stat = self.xml_path.stat()
         metadata = {
             "xml_hash": self._get_xml_hash(),
+            "xml_mtime_ns": stat.st_mtime_ns,
+            "xml_size": stat.st_size,
             "indexed_at": datetime.now().isoformat(),
             "page_count": len(self.pages),
             "help_id_count": len(self.help_id_map),
             "help_root": str(self.help_root),
         }
-        self.metadata_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+        self.metadata_path.write_bytes(json_dumps_indented(metadata))
         logger.info(f"Saved metadata: {metadata['page_count']} pages, {metadata['help_id_count']} HelpIDs")
 
     def needs_reindex(self) -> bool:
         """Check if XML has changed and reindexing is needed.
 
+        A matching file modification time and size is taken as "unchanged"
+        without reading the file; otherwise the content hash decides.
+
         Returns:
             True if brhelpcontent.xml has changed or no metadata exists
         """
@@ -127,6 +310,11 @@ class HelpContentIndexer:
             logger.info("No metadata found - full index required")
             return True
 
+        stat = self.xml_path.stat()
+        if stat.st_mtime_ns == metadata.get("xml_mtime_ns") and stat.st_size == metadata.get("xml_size"):
+            logger.info("XML file unchanged (mtime and size match) - can use existing index")
+            return False
+
         current_hash = self._get_xml_hash()
         has_changed = metadata.get("xml_hash") != current_hash
 
@@ -134,30 +322,78 @@ class HelpContentIndexer:
             logger.info("XML file has changed - reindex required")
         else:
             logger.info("XML file unchanged - can use existing index")
+            # Same content, new stat (touched or re-copied): record it so later starts skip hashing again
+            metadata["xml_mtime_ns"] = stat.st_mtime_ns
+            metadata["xml_size"] = stat.st_size
+            try:
+                self.metadata_path.write_bytes(json_dumps_indented(metadata))
+            except OSError as e:  # pragma: no cover
+                logger.warning(f"Failed to update metadata: {e}")  # pragma: no cover
 
         return has_changed
 
     def parse_xml_structure(self) -> None:
-        """Parse brhelpcontent.xml to extract structure and metadata."""
+        """Parse brhelpcontent.xml to extract structure and metadata.
+
+        If the pickled index cache from a previous run matches the current XML,
+        it is loaded instead and parsing is skipped entirely.
+
+        Otherwise the file is streamed with iterparse instead of building the
+        full DOM first. Each Section/Page is registered on its start event (so
+        children see the correct parent ID on the stack) and its element is
+        cleared on the end event, keeping only the currently open branch of the
+        tree in memory.
+        """
+        if self._load_index_cache():
+            return
+
         logger.info(f"Parsing {self.xml_path}")
         start_time = datetime.now()
 
         try:
-            tree = DefusedET.parse(self.xml_path)
-            root = tree.getroot()
+            # Open elements as (tag, page): page is the HelpPage created for a
+            # Section/Page element, or None for the root and any other element.
+            open_elems: list[tuple[str, HelpPage | None]] = []
+            root: ET.Element | lxml_etree._Element | None = None
+
+            for event, elem in self._iterparse():
+                if event == "end":
+                    _, closed_page = open_elems.pop()
+                    if closed_page is not None:
+                        elem.clear()
+                        # Top-level entries are done - drop their (now empty) shells from the root
+                        if len(open_elems) == 1 and root is not None:
+                            root.clear()
+                    continue
+
+                tag = elem.tag
+                page: HelpPage | None = None
+
+                if root is None:
+                    root = elem
+                    logger.info(f"Root element: {root.tag}")
+                else:
+                    parent_tag, parent_page = open_elems[-1]
+                    # Sections and pages are only taken from the root or from inside a section
+                    # (tags may be abbreviated: S=Section, P=Page)
+                    is_section = _ENTRY_TAGS.get(tag)
+                    if is_section is not None:
+                        if len(open_elems) == 1 or (parent_page is not None and parent_page.is_section):
+                            page = self._register_entry(elem, parent_page.id if parent_page else None, is_section)
+                    elif tag in HELP_ID_TAGS and len(open_elems) >= 2 and parent_tag in IDENTIFIERS_TAGS:
+                        # HelpID may be in <Identifiers> or <I> directly below the entry
+                        owner = open_elems[-2][1]
+                        if owner is not None and owner.help_id is None:
+                            help_id = _extract_help_id(elem)
+                            if help_id:
+                                owner.help_id = help_id
+                                self.help_id_map[help_id] = owner.id
+
+                open_elems.append((tag, page))
 
             if root is None:
                 raise ValueError("Failed to parse XML: root element is None")  # pragma: no cover
 
-            logger.info(f"Root element: {root.tag}")
-
-            # Process sections and pages - tags may be abbreviated (S=Section, P=Page)
-            for child in root:
-                if child.tag in ("Section", "S"):  # S is abbreviated Section
-                    self._process_section(child, None)
-                elif child.tag in ("Page", "P"):  # P is abbreviated Page
-                    self._process_page(child, None)
-
             elapsed = (datetime.now() - start_time).total_seconds()
             logger.info(f"Indexed {len(self.pages)} pages and sections in {elapsed:.2f}s")
             logger.info(f"Found {len(self.help_id_map)} HelpID mappings")
@@ -184,6 +420,9 @@ class HelpContentIndexer:
             self._precompute_breadcrumbs()
             logger.info(f"Breadcrumb cache populated: {len(self._breadcrumb_cache)} entries")
 
+            self._sort_children()
+            self._compute_structure_stats()
+
             # Log top-level categories for visibility at startup
             categories = self.get_top_level_categories()
             logger.info(f"Found {len(categories)} top-level categories:")
@@ -192,182 +431,164 @@ class HelpContentIndexer:
 
             # Save metadata for future incremental checks
             self._save_metadata()
+            self._save_index_cache()
 
-        except ET.ParseError as e:  # pragma: no cover
+        except (ET.ParseError, lxml_etree.XMLSyntaxError) as e:  # pragma: no cover
             logger.error(f"Failed to parse XML: {e}")  # pragma: no cover
             raise  # pragma: no cover
 
-    def _process_section(self, section_elem: ET.Element, parent_id: str | None = None) -> None:
-        """Process a Section element recursively.
+    def _save_index_cache(self) -> None:
+        """Pickle the parsed structure so the next start can skip parsing.
 
-        Handles both full and abbreviated XML formats:
-        - Full: <Section Text="..." File="..." Id="...">
-        - Abbreviated: <S t="..." p="..." Id="...">
+        Breadcrumb tuples reference the same HelpPage objects as ``pages``;
+        pickle keeps that sharing on load.
         """
-        section_id = section_elem.get("Id")
-        # Handle both full (Text) and abbreviated (t) attribute names
-        text = section_elem.get("Text", section_elem.get("t", ""))
-        file_path = section_elem.get("File", section_elem.get("p", ""))
+        stat = self.xml_path.stat()
+        payload = {
+            "version": _INDEX_CACHE_VERSION,
+            "xml_key": (stat.st_mtime_ns, stat.st_size, self._get_xml_hash()),
+            "pages": self.pages,
+            "help_id_map": self.help_id_map,
+            "children": self._children,
+            "breadcrumbs": self._breadcrumb_cache,
+            "breadcrumb_strings": self._breadcrumb_strings,
+            "duplicate_ids": self._duplicate_ids,
+        }
+        tmp_path = self.index_cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_cache_path)
+        except OSError as e:  # pragma: no cover
+            logger.warning(f"Failed to write index cache: {e}")  # pragma: no cover
 
-        if not section_id:
-            return  # pragma: no cover
+    def _load_index_cache(self) -> bool:
+        """Populate the indexer from the index cache if it matches the current XML.
 
-        # Check for duplicate ID (B&R XML data issue)
-        # Generate a unique synthetic ID so this occurrence gets its own
-        # identity and its children trace the correct breadcrumb path.
-        if section_id in self.pages:
-            existing = self.pages[section_id]
-            if section_id not in self._duplicate_ids:
-                self._duplicate_ids[section_id] = [existing.text]
-            self._duplicate_ids[section_id].append(text)
-
-            count = self._dup_id_counter.get(section_id, 0) + 1
-            self._dup_id_counter[section_id] = count
-            synthetic_id = f"{section_id}__dup_{count}"
-
-            dup_page = HelpPage(
-                id=synthetic_id,
-                text=text,
-                file_path=file_path,
-                parent_id=parent_id,
-                is_section=True,
-            )
+        A matching mtime and size is trusted; otherwise the content hash must match,
+        and the cache is then rewritten with the new mtime and size.
 
-            # Extract HelpID for the duplicate section
-            dup_identifiers = section_elem.find("Identifiers")
-            if dup_identifiers is None:
-                dup_identifiers = section_elem.find("I")
-            if dup_identifiers is not None:
-                dup_help_id_elem = dup_identifiers.find("HelpID")
-                if dup_help_id_elem is None:
-                    dup_help_id_elem = dup_identifiers.find("H")
-                if dup_help_id_elem is not None:
-                    dup_help_id = dup_help_id_elem.get("Value")
-                    if dup_help_id is None:
-                        dup_help_id = dup_help_id_elem.get("v")
-                    if dup_help_id:
-                        dup_page.help_id = dup_help_id
-                        self.help_id_map[dup_help_id] = synthetic_id
-
-            self.pages[synthetic_id] = dup_page
-
-            # Process children with the synthetic ID as parent
-            for child in section_elem:
-                if child.tag in ("Section", "S"):
-                    self._process_section(child, synthetic_id)
-                elif child.tag in ("Page", "P"):
-                    self._process_page(child, synthetic_id)
-            return
+        Returns:
+            True if the cache was loaded, False if the XML needs to be parsed
+        """
+        start_time = datetime.now()
+        try:
+            with open(self.index_cache_path, "rb") as f:
+                payload = pickle.load(f)  # nosec B301 - file is written by _save_index_cache
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable index cache: {e}")
+            return False
+
+        if not isinstance(payload, dict) or payload.get("version") != _INDEX_CACHE_VERSION:
+            logger.info("Index cache format changed - parsing XML")
+            return False
+
+        mtime_ns, size, xml_hash = payload["xml_key"]
+        stat = self.xml_path.stat()
+        stat_matches = (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size)
+        if stat_matches:
+            self._hash_cache = (mtime_ns, size, xml_hash)
+        elif self._get_xml_hash() != xml_hash:
+            logger.info("XML changed since index cache was written - parsing XML")
+            return False
+
+        self.pages = payload["pages"]
+        self.help_id_map = payload["help_id_map"]
+        self._children = payload["children"]
+        self._breadcrumb_cache = payload["breadcrumbs"]
+        self._breadcrumb_strings = payload["breadcrumb_strings"]
+        self._duplicate_ids = payload["duplicate_ids"]
+        self._compute_structure_stats()
+        if not stat_matches:
+            self._save_index_cache()
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(
+            f"Loaded {len(self.pages)} pages and {len(self.help_id_map)} HelpIDs from index cache in {elapsed:.2f}s"
+        )
+        return True
+
+    def _iterparse(self) -> Iterator[tuple[str, Any]]:
+        """Return an iterator of (event, element) start/end events for brhelpcontent.xml.
+
+        The lxml (libxml2) parser is used for trusted files. External entities
+        are rejected, the network is never touched and DTDs are not loaded.
+        huge_tree is deliberately left off so libxml2's entity amplification and
+        depth limits stay in force - together this covers what defusedxml guards
+        against. collect_ids is off because nothing looks elements up by xml:id,
+        so libxml2 need not hash every ID attribute.
+        """
+        events = ("start", "end")
+        parser: Iterator[tuple[str, Any]]
+        if self.trusted_xml:
+            parser = lxml_etree.iterparse(
+                str(self.xml_path),
+                events=events,
+                resolve_entities=False,
+                no_network=True,
+                remove_blank_text=True,
+                remove_comments=True,
+                remove_pis=True,
+                collect_ids=False,
+            )
+        else:
+            parser = DefusedET.iterparse(self.xml_path, events=events)
+        return parser
 
-        # Create section entry
-        page = HelpPage(id=section_id, text=text, file_path=file_path, parent_id=parent_id, is_section=True)
-
-        # Check for HelpID - may be in <Identifiers> or <I> element
-        identifiers = section_elem.find("Identifiers")
-        if identifiers is None:
-            identifiers = section_elem.find("I")
-        if identifiers is not None:
-            # Find HelpID (NOTE: must use 'is not None' because empty elements are falsy!)
-            help_id_elem = identifiers.find("HelpID")
-            if help_id_elem is None:
-                help_id_elem = identifiers.find("H")
-            if help_id_elem is not None:
-                help_id = help_id_elem.get("Value")
-                if help_id is None:
-                    help_id = help_id_elem.get("v")
-                if help_id:
-                    page.help_id = help_id
-                    self.help_id_map[help_id] = section_id
-
-        self.pages[section_id] = page
-
-        # Process child sections and pages (handle both full and abbreviated tags)
-        for child in section_elem:
-            if child.tag in ("Section", "S"):
-                self._process_section(child, section_id)
-            elif child.tag in ("Page", "P"):
-                self._process_page(child, section_id)
-
-    def _process_page(self, page_elem: ET.Element, parent_id: str | None = None) -> None:
-        """Process a Page element.
+    def _register_entry(self, elem: Any, parent_id: str | None, is_section: bool) -> HelpPage | None:
+        """Create and register the HelpPage for a Section or Page element.
 
         Handles both full and abbreviated XML formats:
-        - Full: <Page Text="..." File="..." Id="...">
-        - Abbreviated: <P t="..." p="..." Id="...">
-        """
-        page_id = page_elem.get("Id")
-        # Handle both full (Text) and abbreviated (t) attribute names
-        text = page_elem.get("Text", page_elem.get("t", ""))
-        file_path = page_elem.get("File", page_elem.get("p", ""))
+        - Full: <Section Text="..." File="..." Id="..."> / <Page ...>
+        - Abbreviated: <S t="..." p="..." Id="..."> / <P ...>
 
-        if not page_id:
-            return  # pragma: no cover
+        The HelpID is attached later, when its <Identifiers>/<I> child is streamed.
 
-        # Check for duplicate ID (B&R XML data issue)
-        # Generate a unique synthetic ID so this occurrence keeps the correct parent.
-        if page_id in self.pages:
-            existing = self.pages[page_id]
-            if page_id not in self._duplicate_ids:
-                self._duplicate_ids[page_id] = [existing.text]
-            self._duplicate_ids[page_id].append(text)
-
-            count = self._dup_id_counter.get(page_id, 0) + 1
-            self._dup_id_counter[page_id] = count
-            synthetic_id = f"{page_id}__dup_{count}"
-
-            dup_page = HelpPage(
-                id=synthetic_id,
-                text=text,
-                file_path=file_path,
-                parent_id=parent_id,
-                is_section=False,
-            )
+        Returns:
+            The registered HelpPage, or None if the element has no Id
+        """
+        attrib = elem.attrib
+        entry_id = attrib.get("Id")
+        # Handle both full (Text/File) and abbreviated (t/p) attribute names.
+        # A file uses one form throughout, so the Text check decides both.
+        if "Text" in attrib:
+            text = attrib["Text"]
+            file_path = attrib.get("File", attrib.get("p", ""))
+        else:
+            text = attrib.get("t", "")
+            file_path = attrib.get("p", attrib.get("File", ""))
 
-            # Extract HelpID for the duplicate page
-            dup_identifiers = page_elem.find("Identifiers")
-            if dup_identifiers is None:
-                dup_identifiers = page_elem.find("I")
-            if dup_identifiers is not None:
-                dup_help_id_elem = dup_identifiers.find("HelpID")
-                if dup_help_id_elem is None:
-                    dup_help_id_elem = dup_identifiers.find("H")
-                if dup_help_id_elem is not None:
-                    dup_help_id = dup_help_id_elem.get("Value")
-                    if dup_help_id is None:
-                        dup_help_id = dup_help_id_elem.get("v")
-                    if dup_help_id:
-                        dup_page.help_id = dup_help_id
-                        self.help_id_map[dup_help_id] = synthetic_id
-
-            self.pages[synthetic_id] = dup_page
-            return
+        if not entry_id:
+            return None  # pragma: no cover
 
-        page = HelpPage(id=page_id, text=text, file_path=file_path, parent_id=parent_id, is_section=False)
-
-        # Check for HelpID - may be in <Identifiers> or <I> element
-        identifiers = page_elem.find("Identifiers")
-        if identifiers is None:
-            identifiers = page_elem.find("I")
-        if identifiers is not None:
-            # Find HelpID (NOTE: must use 'is not None' because empty elements are falsy!)
-            help_id_elem = identifiers.find("HelpID")
-            if help_id_elem is None:
-                help_id_elem = identifiers.find("H")
-            if help_id_elem is not None:
-                help_id = help_id_elem.get("Value")
-                if help_id is None:
-                    help_id = help_id_elem.get("v")
-                if help_id:
-                    page.help_id = help_id
-                    self.help_id_map[help_id] = page_id
-
-        self.pages[page_id] = page
+        # Check for duplicate ID (B&R XML data issue)
+        # Generate a unique synthetic ID so this occurrence gets its own
+        # identity and its children trace the correct breadcrumb path.
+        existing = self.pages.get(entry_id)
+        if existing is not None:
+            titles = self._duplicate_ids.setdefault(entry_id, [existing.text])
+            titles.append(text)
+            # titles holds the first occurrence plus one entry per duplicate so far
+            entry_id = f"{entry_id}__dup_{len(titles) - 1}"
+
+        # IDs are repeated as dict keys, parent_id fields and child lists, and many
+        # file paths repeat too - intern them so all references share one object.
+        # parent_id is already the parent's interned id. Titles are too varied to benefit.
+        entry_id = sys.intern(entry_id)
+        file_path = sys.intern(file_path)
+        page = HelpPage(id=entry_id, text=text, file_path=file_path, parent_id=parent_id, is_section=is_section)
+        self.pages[entry_id] = page
+        self._children.setdefault(parent_id, []).append(entry_id)
+        return page
 
     def extract_html_content(self, page_id: str) -> str | None:
         """Read HTML content for a page from disk.
 
-        Does NOT cache the result to avoid memory bloat (58K+ pages).
-        File reads are fast enough for on-demand retrieval.
+        Only the most recently retrieved pages are cached (bounded LRU), so
+        repeated requests for hot pages skip the file read without holding
+        all 58K+ pages in memory.
 
         Args:
             page_id: The unique ID of the page
@@ -375,23 +596,25 @@ class HelpContentIndexer:
         Returns:
             The HTML content as a string, or None if file not found
         """
-        if page_id not in self.pages:
+        page = self.pages.get(page_id)
+        if page is None:
             return None
 
-        page = self.pages[page_id]
-
         if not page.file_path:
             return None  # pragma: no cover
 
-        html_file = self.help_root / page.file_path
+        return self._html_cache.get_or_compute(page_id, lambda: self._read_html_file(page))
 
-        if not html_file.exists():
-            logger.debug(f"HTML file not found: {html_file}")
-            return None
+    def _read_html_file(self, page: "HelpPage") -> str | None:
+        """Read a page's HTML file from disk (uncached)."""
+        html_file = self.help_root / page.file_path
 
         try:
             with open(html_file, encoding="utf-8", errors="ignore") as f:
                 return f.read()
+        except FileNotFoundError:
+            logger.debug(f"HTML file not found: {html_file}")
+            return None
         except Exception as e:  # pragma: no cover
             logger.error(f"Failed to read HTML file {html_file}: {e}")  # pragma: no cover
             return None  # pragma: no cover
@@ -411,76 +634,71 @@ class HelpContentIndexer:
         if not page.file_path:
             return None  # pragma: no cover
 
-        html_file = self.help_root / page.file_path
+        return _extract_plain_text_from_file(str(self.help_root / page.file_path))
 
-        if not html_file.exists():
-            return None  # pragma: no cover
+    @staticmethod
+    def create_extraction_pool(max_workers: int | None = None) -> ProcessPoolExecutor:
+        """Create a process pool for bulk_extract_plain_text.
 
-        try:
-            # Use lxml directly for maximum speed (bypasses BeautifulSoup overhead)
-            from lxml import html as lxml_html
+        Callers that extract several batches (e.g. chunked index builds) should
+        create the pool once and pass it to each call, so worker processes are
+        started only once.
 
-            with open(html_file, "rb") as f:  # Read as bytes for lxml
-                tree = lxml_html.parse(f)
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+        """
+        # spawn: forking a process that already runs LanceDB/tokio threads can deadlock
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def bulk_extract_plain_text(
+        self,
+        page_ids: Iterable[str] | None = None,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+        chunksize: int = 64,
+    ) -> Iterator[tuple[str, str | None]]:
+        """Extract plain text for many pages in parallel worker processes.
+
+        HTML parsing is CPU-bound, so threads are serialized by the GIL; each
+        worker process parses files independently. Only file paths and result
+        strings cross the process boundary. Like the single-page path, results
+        are not stored on the HelpPage objects.
 
-            root = tree.getroot()
-            if root is None:
-                return None  # pragma: no cover
-
-            # Remove script and style elements using XPath (faster than Cleaner)
-            # Cast to lxml HtmlElement to access xpath method
-            from typing import cast
-
-            from lxml.html import HtmlElement
-
-            root_elem = cast(HtmlElement, root)
-            for element in root_elem.xpath(".//script | .//style"):
-                element.getparent().remove(element)
-
-            # Extract text with proper spacing between block elements
-            # Using get_text() with separator to preserve word boundaries
-            text_parts: list[str] = []
-            for elem in root.iter():
-                if elem.text:
-                    text_parts.append(elem.text)
-                # Add space after block-level elements to preserve word boundaries
-                if elem.tag in (
-                    "p",
-                    "div",
-                    "h1",
-                    "h2",
-                    "h3",
-                    "h4",
-                    "h5",
-                    "h6",
-                    "li",
-                    "td",
-                    "th",
-                    "tr",
-                    "table",
-                    "blockquote",
-                    "pre",
-                ):
-                    text_parts.append(" ")
-                if elem.tail:
-                    text_parts.append(elem.tail)
-
-            text = "".join(text_parts) if text_parts else ""
-
-            if text:
-                text_result = " ".join(text.split())
-                return text_result
-            return None  # pragma: no cover
-        except Exception as e:  # pragma: no cover
-            logger.debug(f"Failed to extract text from {html_file}: {e}")  # pragma: no cover
-            return None  # pragma: no cover
+        Args:
+            page_ids: Pages to extract (defaults to all pages)
+            max_workers: Number of worker processes when no executor is given (defaults to CPU count)
+            executor: Existing pool to run on (see create_extraction_pool); it is left open
+            chunksize: Number of files sent to a worker per task
+
+        Returns:
+            Iterator of (page_id, plain_text) pairs in input order; plain_text is None
+            if extraction fails. With an executor, all tasks are submitted before this
+            returns, so the caller can do other work while the workers parse.
+        """
+        ids = list(self.pages) if page_ids is None else list(page_ids)
+        if not ids:
+            return iter(())
+
+        help_root = self.help_root
+        paths = [str(help_root / self.pages[pid].file_path) if self.pages[pid].file_path else "" for pid in ids]
+
+        if executor is not None:
+            return zip(ids, executor.map(_extract_plain_text_from_file, paths, chunksize=chunksize), strict=True)
+        return self._extract_in_new_pool(ids, paths, max_workers, chunksize)
+
+    def _extract_in_new_pool(
+        self, ids: list[str], paths: list[str], max_workers: int | None, chunksize: int
+    ) -> Iterator[tuple[str, str | None]]:
+        """Run bulk extraction on a pool that lives as long as the returned generator."""
+        with self.create_extraction_pool(max_workers) as pool:
+            yield from zip(ids, pool.map(_extract_plain_text_from_file, paths, chunksize=chunksize), strict=True)
 
     def extract_plain_text(self, page_id: str) -> str | None:
         """Extract plain text from HTML content.
 
-        Reads HTML from disk and parses with lxml on each call.
-        Does NOT cache the result to avoid memory bloat (58K+ pages).
-        lxml parsing is fast (~1ms per page).
+        Reads HTML from disk and parses it with lxml. Only the most recently
+        retrieved pages are cached (bounded LRU), so the LLM re-reading the
+        same few pages doesn't re-parse them, while memory stays flat.
 
         Args:
             page_id: The unique ID of the page
@@ -488,11 +706,15 @@ class HelpContentIndexer:
         Returns:
             Plain text content, or None if extraction fails
         """
-        if page_id not in self.pages:
+        page = self.pages.get(page_id)
+        if page is None:
             return None  # pragma: no cover
 
-        page = self.pages[page_id]
-        return self._extract_plain_text_no_cache(page)
+        return self._text_cache.get_or_compute(page_id, lambda: self._extract_plain_text_no_cache(page))
+
+    def content_cache_info(self) -> dict[str, dict[str, int]]:
+        """Hit/miss counters and sizes of the plain text and HTML caches."""
+        return {"plain_text": self._text_cache.info(), "html": self._html_cache.info()}
 
     def get_page_by_help_id(self, help_id: str) -> HelpPage | None:
         """Get a page by its HelpID.
@@ -524,6 +746,8 @@ class HelpContentIndexer:
 
         This avoids repeated breadcrumb computation during search operations
         and ensures consistent results even with duplicate IDs in the XML.
+        Every ancestor resolved along the way is cached too, so each page is
+        visited roughly once in total.
         """
         computed = 0
         for page_id in self.pages:
@@ -532,56 +756,90 @@ class HelpContentIndexer:
                 computed += 1
         logger.debug(f"Computed {computed} breadcrumbs")
 
-    def _compute_breadcrumb(self, page_id: str) -> list[HelpPage]:
+    def _compute_breadcrumb(self, page_id: str) -> tuple[HelpPage, ...]:
         """Compute breadcrumb for a single page (internal method).
 
+        Walks up the parent chain only until an ancestor with a cached
+        breadcrumb is found, then builds each breadcrumb top-down as
+        ``parent_breadcrumb + (page,)``, caching every level on the way.
+        The ' > ' joined string form is built the same way from the parent's
+        string, so it never has to be re-joined per lookup.
+
         Args:
             page_id: The unique page ID
 
         Returns:
-            List of HelpPage objects from root to current page
+            Tuple of HelpPage objects from root to current page
         """
-        breadcrumb: list[HelpPage] = []
+        cache = self._breadcrumb_cache
+        strings = self._breadcrumb_strings
+        pages = self.pages
+
+        chain: list[HelpPage] = []  # Requested page first, then its uncached ancestors
+        visited: set[str] = set()  # Prevent infinite loops from inconsistent parent links
+        base: tuple[HelpPage, ...] = ()
+        base_string = ""
+        clean = True  # False if the walk was cut short by a cycle
         current_id: str | None = page_id
-        visited = set()  # Prevent infinite loops from duplicate IDs in XML
 
         while current_id:
-            # Check for cycles (caused by duplicate IDs in B&R XML, not true circular refs)
+            # The requested page is always recomputed; its ancestors may come from the cache
+            if current_id != page_id and current_id in cache:
+                base = cache[current_id]
+                base_string = strings[current_id]
+                break
+
+            # Duplicate IDs get synthetic IDs during parsing, so a cycle here means
+            # the parent links were altered after the fact.
             if current_id in visited:
-                # This happens when B&R XML has duplicate IDs - the same ID appears
-                # in different parts of the tree (e.g., 'General information' and 'Status numbers')
-                # The later occurrence overwrites the earlier one, causing apparent cycles.
-                # This is a B&R XML data quality issue, not a bug in our code.
-                logger.debug(f"Duplicate ID detected in breadcrumb for '{page_id}': stopping at {current_id}")
+                logger.debug(f"Cycle detected in breadcrumb for '{page_id}': stopping at {current_id}")
+                clean = False
                 break
 
             visited.add(current_id)
 
-            page = self.pages.get(current_id)
+            page = pages.get(current_id)
             if not page:
                 logger.debug(f"Breadcrumb traversal stopped: page_id '{current_id}' not found")
                 break
 
-            breadcrumb.insert(0, page)
+            chain.append(page)
             current_id = page.parent_id
 
-            # Safety limit to prevent extremely deep hierarchies
-            if len(breadcrumb) > 100:
-                logger.error(f"Breadcrumb depth exceeded 100 levels for '{page_id}' - stopping")
-                break
+        if not chain:
+            return ()
+
+        truncated = False
+        breadcrumb = base
+        breadcrumb_string = base_string
+        for page in reversed(chain):
+            breadcrumb = (*breadcrumb, page)
+            # Safety limit for extremely deep hierarchies: keep the nearest 101 levels
+            if len(breadcrumb) > 101:
+                breadcrumb = breadcrumb[1:]
+                breadcrumb_string = " > ".join(p.text for p in breadcrumb)
+                truncated = True
+            else:
+                breadcrumb_string = f"{breadcrumb_string} > {page.text}" if breadcrumb_string else page.text
+            # Ancestors are only cached when the walk ended normally; after a cycle
+            # their partial paths would depend on where the walk started.
+            if clean or page is chain[0]:
+                cache[page.id] = breadcrumb
+                strings[page.id] = breadcrumb_string
+
+        if truncated:
+            logger.error(f"Breadcrumb depth exceeded 100 levels for '{page_id}' - truncated")
 
-        # Cache the result
-        self._breadcrumb_cache[page_id] = breadcrumb
         return breadcrumb
 
-    def get_breadcrumb(self, page_id: str) -> list[HelpPage]:
+    def get_breadcrumb(self, page_id: str) -> tuple[HelpPage, ...]:
         """Get the breadcrumb trail for a page.
 
         Args:
             page_id: The unique page ID
 
         Returns:
-            List of HelpPage objects from root to current page
+            Tuple of HelpPage objects from root to current page
         """
         # Return cached breadcrumb (pre-computed during indexing)
         if page_id in self._breadcrumb_cache:
@@ -599,8 +857,48 @@ class HelpContentIndexer:
         Returns:
             String like 'Root > Section > Subsection > Page'
         """
-        breadcrumb = self.get_breadcrumb(page_id)
-        return " > ".join(p.text for p in breadcrumb) if breadcrumb else ""
+        breadcrumb_string = self._breadcrumb_strings.get(page_id)
+        if breadcrumb_string is not None:
+            return breadcrumb_string
+
+        breadcrumb = self._compute_breadcrumb(page_id)
+        return self._breadcrumb_strings[page_id] if breadcrumb else ""
+
+    def _sort_children(self) -> None:
+        """Order every child list for navigation once: sections first, then pages, each by title.
+
+        browse_section and get_categories then serve the lists as stored.
+        """
+        pages = self.pages
+
+        def nav_key(child_id: str) -> tuple[bool, str]:
+            page = pages[child_id]
+            return (not page.is_section, page.sort_key)
+
+        for child_ids in self._children.values():
+            child_ids.sort(key=nav_key)
+
+    def _compute_structure_stats(self) -> None:
+        """Count sections and hierarchy links in one pass so statistics calls don't rescan pages."""
+        total_sections = 0
+        root_items = 0
+        for page in self.pages.values():
+            total_sections += page.is_section
+            root_items += page.parent_id is None
+
+        total_pages = len(self.pages)
+        self._structure_stats = {
+            "total_pages": total_pages,
+            "total_sections": total_sections,
+            "regular_pages": total_pages - total_sections,
+            "help_id_mappings": len(self.help_id_map),
+            "pages_with_parents": total_pages - root_items,
+            "root_items": root_items,
+        }
+
+    def get_structure_stats(self) -> dict[str, int]:
+        """Page, section, HelpID and hierarchy counts computed when the structure was loaded."""
+        return dict(self._structure_stats)
 
     def get_top_level_categories(self) -> list[dict]:
         """Get all root-level sections (categories) from the help content.
@@ -611,12 +909,10 @@ class HelpContentIndexer:
         Returns:
             List of dicts with 'id', 'title', and 'file_path' keys for each root section.
         """
-        categories = []
-        for _, page in self.pages.items():
-            if page.parent_id is None and page.is_section:
-                categories.append({"id": page.id, "title": page.text, "file_path": page.file_path})
-        # Sort alphabetically by title for consistent ordering
-        return sorted(categories, key=lambda x: x["title"].lower())
+        pages = self.pages
+        # Child lists are pre-sorted (sections first, by title), so filtering keeps the order
+        roots = [page for page in (pages[child_id] for child_id in self._children.get(None, ())) if page.is_section]
+        return [{"id": page.id, "title": page.text, "file_path": page.file_path} for page in roots]
 
     def get_section_children(self, section_id: str) -> list[SectionChild]:
         """Get all immediate children of a section.
@@ -635,14 +931,9 @@ class HelpContentIndexer:
             logger.warning(f"Section '{section_id}' not found")
             return []
 
-        children: list[SectionChild] = []
-        for _, page in self.pages.items():
-            if page.parent_id == section_id:
-                children.append(
-                    {"id": page.id, "title": page.text, "file_path": page.file_path, "is_section": page.is_section}
-                )
-
-        # Sort: sections first (alphabetically), then pages (alphabetically)
-        sections = sorted([c for c in children if c["is_section"]], key=lambda x: x["title"].lower())
-        pages = sorted([c for c in children if not c["is_section"]], key=lambda x: x["title"].lower())
-        return sections + pages
+        pages = self.pages
+        # Already ordered sections first, then pages, alphabetically (see _sort_children)
+        return [
+            {"id": page.id, "title": page.text, "file_path": page.file_path, "is_section": page.is_section}
+            for page in (pages[child_id] for child_id in self._children.get(section_id, ()))
+        ]
@@ -9,6 +9,7 @@ tokenization (stemming, stop-word removal, ASCII folding), and the
 ``with_position=False`` optimisation since we don't need phrase queries.
 """
 
+import heapq
 import json
 import logging
 import os
@@ -16,17 +17,23 @@ import re
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import lancedb
 import pyarrow as pa
+import pyarrow.compute as pc
 
 if TYPE_CHECKING:
     from src.embeddings import EmbeddingService
 
-from src.indexer import HelpContentIndexer
+from src.indexer import HelpContentIndexer, HelpPage, json_dumps_indented
 
 logger = logging.getLogger(__name__)
 
@@ -47,9 +54,42 @@ WEIGHT_FTS_KEYWORD_ID = 3.0
 WEIGHT_TITLE_MATCH_ID = 4.0
 WEIGHT_BREADCRUMB_MATCH_ID = 3.0
 
+# (title vector, content vector, FTS keyword, title match, breadcrumb match)
+_RRF_WEIGHTS = (
+    WEIGHT_TITLE_VECTOR,
+    WEIGHT_CONTENT_VECTOR,
+    WEIGHT_FTS_KEYWORD,
+    WEIGHT_TITLE_MATCH,
+    WEIGHT_BREADCRUMB_MATCH,
+)
+_RRF_WEIGHTS_ID = (
+    WEIGHT_TITLE_VECTOR_ID,
+    WEIGHT_CONTENT_VECTOR_ID,
+    WEIGHT_FTS_KEYWORD_ID,
+    WEIGHT_TITLE_MATCH_ID,
+    WEIGHT_BREADCRUMB_MATCH_ID,
+)
+
 # Number of pages per chunk during index build (saves progress after each chunk)
 BUILD_CHUNK_SIZE = 5000
 
+# Batches smaller than this are parsed inline: starting worker processes costs more than the parsing
+SERIAL_EXTRACTION_THRESHOLD = 256
+
+# Finished result lists kept for repeated identical searches once the index is ready
+SEARCH_CACHE_SIZE = 1024
+
+# Seconds close() waits for a background optimize before leaving it to finish on its own
+OPTIMIZE_JOIN_TIMEOUT = 10.0
+
+# FTS query syntax characters replaced by spaces before searching (one
+# str.translate pass instead of a replace() per character)
+_FTS_SANITIZE_TABLE = str.maketrans(dict.fromkeys("\"'*:(){}^+[]-", " "))
+# Breadcrumb matching also splits on "/" (the breadcrumb path separator)
+_BREADCRUMB_SANITIZE_TABLE = str.maketrans(dict.fromkeys("\"'*:(){}^+[]-/", " "))
+# Reserved boolean keywords dropped from queries
+_FTS_KEYWORDS = frozenset(("and", "or", "not", "near"))
+
 # Pattern for technical identifiers: PascalCase, snake_case, UPPER_CASE, dotted names
 # e.g. MC_MoveAbsolute, AsGuard, SYS_Lib, X20DI9371, mapp.Motion
 _IDENTIFIER_RE = re.compile(
@@ -57,6 +97,16 @@ _IDENTIFIER_RE = re.compile(
 )
 
 
+@lru_cache(maxsize=512)
+def _query_terms(query: str) -> tuple[str, ...]:
+    """Split a query into terms of 2+ chars with FTS syntax characters removed.
+
+    Memoized because one search sanitizes the same query for the FTS leg and
+    again for every result snippet.
+    """
+    return tuple(t for t in query.translate(_FTS_SANITIZE_TABLE).split() if len(t) >= 2)
+
+
 def _is_identifier_query(query: str) -> bool:
     """Detect if a query looks like a technical identifier rather than natural language.
 
@@ -92,6 +142,23 @@ class HelpSearchEngine:
         "language": "English",
     }
 
+    # Bump when the table layout changes so existing indexes are rebuilt
+    _SCHEMA_VERSION = 2
+
+    # Columns read back for search results. Native FTS indexes a single
+    # column, so search_text duplicates title, breadcrumb and content; it and
+    # the vector columns are never needed in results, so they are not read.
+    _RESULT_COLUMNS: list[str] = [
+        "page_id",
+        "title",
+        "content",
+        "file_path",
+        "help_id",
+        "is_section",
+        "breadcrumb_path",
+        "category",
+    ]
+
     # Class-level tracking of active db_paths in this process
     _active_db_paths: set[str] = set()
     _active_db_paths_lock = threading.Lock()
@@ -110,6 +177,18 @@ class HelpSearchEngine:
         self._ready = threading.Event()
         self._fts_ready = threading.Event()
         self._build_error: Exception | None = None
+        # Worker processes for HTML text extraction, started lazily once per build
+        self._extraction_pool: ProcessPoolExecutor | None = None
+        self._extraction_workers = min(int(os.cpu_count() or 4), 20)
+        # Table handle reused by search() once the index is fully built
+        self._search_table = None
+        self._optimize_thread: threading.Thread | None = None
+        # Set by the optimize thread once it has committed; search() then reopens its table handle
+        self._table_optimized = threading.Event()
+        # LRU of search() results; only filled once ready, when the table no longer changes.
+        # Rows are stored as private copies and copied again on every hit, so callers can't alter the cache.
+        self._result_cache: OrderedDict[tuple, tuple[dict, ...]] = OrderedDict()
+        self._result_cache_lock = threading.Lock()
 
         # Build status tracking
         self._build_status: dict = {
@@ -134,6 +213,12 @@ class HelpSearchEngine:
         self._instance_lock_path = self.db_path / "_instance.lock"
         self._instance_lock_owned = False
         self._acquire_instance_lock()
+        # Releases the instance lock and the embedding client exactly once: from close(),
+        # when the engine is garbage collected, or at interpreter exit. Unlike __del__,
+        # this holds no reference to the engine.
+        self._finalizer = weakref.finalize(
+            self, self._release_resources, self._instance_lock_path, str(self.db_path.resolve()), self.embedder
+        )
 
         if force_rebuild:
             self._build_strategy = "full"
@@ -202,6 +287,9 @@ class HelpSearchEngine:
             self._build_status["state"] = "ready"
             self._build_status["phase"] = "complete"
             self._build_status["completed_at"] = time.time()
+
+            if self._build_strategy != "none":
+                self._start_background_optimize()
         except Exception as e:
             self._build_error = e
             self._build_status["state"] = "error"
@@ -209,6 +297,7 @@ class HelpSearchEngine:
             logger.error(f"Search index initialization failed: {e}")
             raise
         finally:
+            self._shutdown_extraction_pool()
             self._release_build_lock()
             self._ready.set()
         return self
@@ -268,8 +357,6 @@ class HelpSearchEngine:
 
     def _detect_build_strategy(self) -> str:
         """Determine build strategy: full, incremental, or none."""
-        if not self._metadata_path.exists():
-            return "full"
         try:
             with open(self._metadata_path) as f:
                 metadata = json.load(f)
@@ -292,6 +379,11 @@ class HelpSearchEngine:
                 logger.info("Embedding model changed - full rebuild required")
                 return "full"
 
+        # Table layout changed -> full rebuild
+        if metadata.get("schema_version", 1) != self._SCHEMA_VERSION:
+            logger.info("Index schema changed - full rebuild required")
+            return "full"
+
         # FTS tokenizer config changed -> full rebuild
         if metadata.get("fts_config") != self._FTS_CONFIG:
             logger.info("FTS tokenizer config changed - full rebuild required")
@@ -318,44 +410,65 @@ class HelpSearchEngine:
             "help_id_count": len(self.indexer.help_id_map),
             "embeddings_enabled": self._embeddings_enabled,
             "fts_config": self._FTS_CONFIG,
+            "schema_version": self._SCHEMA_VERSION,
             "page_fingerprints": self.indexer.get_page_fingerprints(),
         }
         if self._embeddings_enabled and self.embedder is not None:
             metadata["embedding_model"] = self.embedder.model_name
             metadata["embedding_dimension"] = self.embedder.dimension
-        with open(self._metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        self._metadata_path.write_bytes(json_dumps_indented(metadata))
 
     # ------------------------------------------------------------------
     # Text extraction helper
     # ------------------------------------------------------------------
 
-    def _extract_text_for_page(self, page_id: str, page) -> tuple:
-        """Extract text for a single page (used for parallel processing).
+    def _extract_records(self, items: list[tuple[str, HelpPage]]) -> list[tuple]:
+        """Extract text for many pages in parallel and build their index records.
+
+        HTML parsing is CPU-bound, so it runs in worker processes (threads would
+        be serialized by the GIL); small batches with no pool running yet are
+        parsed inline instead. Only file paths go to the workers; the
+        breadcrumb and category columns are built here while they parse, and the
+        records are assembled from the columns.
 
-        Both sections and pages get their HTML content extracted when available.
-        Many B&R sections contain substantive documentation (e.g., LED tables,
-        wiring diagrams) that is valuable for search.
+        Sections get their HTML extracted too: many B&R sections carry real
+        documentation (LED tables, wiring diagrams) that is worth searching.
+
+        Returns:
+            One (page_id, title, content, file_path, help_id, is_section,
+            breadcrumb_path, category) tuple per item, in input order
         """
-        plain_text = self.indexer._extract_plain_text_no_cache(page) or ""
-
-        breadcrumb_path = self.indexer.get_breadcrumb_string(page_id)
-
-        category = ""
-        breadcrumb = self.indexer.get_breadcrumb(page_id)
-        if breadcrumb and len(breadcrumb) > 0:
-            category = breadcrumb[0].text
-
-        return (
-            page_id,
-            page.text,  # title
-            plain_text,  # content
-            page.file_path,
-            page.help_id or "",
-            1 if page.is_section else 0,
-            breadcrumb_path,
-            category,
-        )
+        if not items:
+            return []
+
+        texts: Iterable[tuple[str, str | None]]
+        if self._extraction_pool is None and len(items) < SERIAL_EXTRACTION_THRESHOLD:
+            texts = [(pid, self.indexer._extract_plain_text_no_cache(page)) for pid, page in items]
+        else:
+            if self._extraction_pool is None:
+                self._extraction_pool = HelpContentIndexer.create_extraction_pool(self._extraction_workers)
+
+            # ~4 tasks per worker: enough slack to balance uneven pages, few enough
+            # that per-task pickling/IPC is amortized over many files
+            chunksize = max(1, len(items) // (self._extraction_workers * 4))
+            texts = self.indexer.bulk_extract_plain_text(
+                [pid for pid, _ in items], executor=self._extraction_pool, chunksize=chunksize
+            )
+
+        indexer = self.indexer
+        breadcrumb_paths = [indexer.get_breadcrumb_string(pid) for pid, _ in items]
+        categories = [bc[0].text if (bc := indexer.get_breadcrumb(pid)) else "" for pid, _ in items]
+
+        return [
+            (pid, page.text, text or "", page.file_path, page.help_id or "", 1 if page.is_section else 0, path, cat)
+            for (pid, page), (_, text), path, cat in zip(items, texts, breadcrumb_paths, categories, strict=True)
+        ]
+
+    def _shutdown_extraction_pool(self) -> None:
+        """Stop the extraction worker processes, if any were started."""
+        if self._extraction_pool is not None:
+            self._extraction_pool.shutdown()
+            self._extraction_pool = None
 
     # ------------------------------------------------------------------
     # Schema helpers
@@ -374,6 +487,7 @@ class HelpSearchEngine:
                 pa.field("is_section", pa.int32()),
                 pa.field("breadcrumb_path", pa.utf8()),
                 pa.field("category", pa.utf8()),
+                pa.field("category_lc", pa.utf8()),
             ]
         )
 
@@ -391,6 +505,7 @@ class HelpSearchEngine:
                 pa.field("is_section", pa.int32()),
                 pa.field("breadcrumb_path", pa.utf8()),
                 pa.field("category", pa.utf8()),
+                pa.field("category_lc", pa.utf8()),
                 pa.field("title_vector", pa.list_(pa.float32(), dim)),
                 pa.field("content_vector", pa.list_(pa.float32(), dim)),
             ]
@@ -402,38 +517,42 @@ class HelpSearchEngine:
             return self._get_hybrid_schema()
         return self._get_fts_schema()
 
+    @staticmethod
+    def _records_to_columns(records) -> dict:
+        """Transpose record tuples into the shared (non-vector) table columns.
+
+        zip(*records) does the transpose in one C-level pass instead of one
+        Python comprehension per column, and search_text is concatenated by
+        Arrow rather than with a Python f-string per row.
+        """
+        page_ids, titles, contents, file_paths, help_ids, is_sections, breadcrumbs, categories = (
+            zip(*records, strict=True) if records else ((),) * 8
+        )
+        title_arr = pa.array(titles, pa.utf8())
+        content_arr = pa.array(contents, pa.utf8())
+        breadcrumb_arr = pa.array(breadcrumbs, pa.utf8())
+        return {
+            "page_id": page_ids,
+            "title": title_arr,
+            "content": content_arr,
+            "search_text": pc.binary_join_element_wise(title_arr, breadcrumb_arr, content_arr, " "),
+            "file_path": file_paths,
+            "help_id": help_ids,
+            "is_section": is_sections,
+            "breadcrumb_path": breadcrumb_arr,
+            "category": categories,
+            "category_lc": [c.lower() for c in categories],
+        }
+
     def _records_to_fts_arrow(self, records) -> pa.Table:
         """Convert records to a FTS-only PyArrow table (no vectors)."""
-        search_texts = [f"{r[1]} {r[6]} {r[2]}" for r in records]
-        data = {
-            "page_id": [r[0] for r in records],
-            "title": [r[1] for r in records],
-            "content": [r[2] for r in records],
-            "search_text": search_texts,
-            "file_path": [r[3] for r in records],
-            "help_id": [r[4] for r in records],
-            "is_section": [r[5] for r in records],
-            "breadcrumb_path": [r[6] for r in records],
-            "category": [r[7] for r in records],
-        }
-        return pa.table(data, schema=self._get_fts_schema())
+        return pa.table(self._records_to_columns(records), schema=self._get_fts_schema())
 
     def _records_to_hybrid_arrow(self, records, title_vectors, content_vectors) -> pa.Table:
         """Convert records + embeddings to a hybrid PyArrow table."""
-        search_texts = [f"{r[1]} {r[6]} {r[2]}" for r in records]
-        data = {
-            "page_id": [r[0] for r in records],
-            "title": [r[1] for r in records],
-            "content": [r[2] for r in records],
-            "search_text": search_texts,
-            "file_path": [r[3] for r in records],
-            "help_id": [r[4] for r in records],
-            "is_section": [r[5] for r in records],
-            "breadcrumb_path": [r[6] for r in records],
-            "category": [r[7] for r in records],
-            "title_vector": title_vectors,
-            "content_vector": content_vectors,
-        }
+        data = self._records_to_columns(records)
+        data["title_vector"] = title_vectors
+        data["content_vector"] = content_vectors
         return pa.table(data, schema=self._get_hybrid_schema())
 
     def _build_content_vectors(self, records, title_vectors) -> list[list[float]]:
@@ -476,11 +595,12 @@ class HelpSearchEngine:
         if resume_ids:
             pages_to_process = [(pid, page) for pid, page in all_pages if pid not in resume_ids]
             already_done = total_pages - len(pages_to_process)
-            table_created = True
+            # One handle for all chunk writes instead of reopening the table per chunk
+            table = self.db.open_table(self.TABLE_NAME)
         else:
             pages_to_process = all_pages
             already_done = 0
-            table_created = False
+            table = None
             try:
                 if self.TABLE_NAME in self.db.list_tables().tables:
                     self.db.drop_table(self.TABLE_NAME)
@@ -498,7 +618,7 @@ class HelpSearchEngine:
 
         self._save_build_progress()
 
-        max_workers = min(int(os.cpu_count() or 4), 20)
+        max_workers = self._extraction_workers
         remaining = len(pages_to_process)
         total_chunks = (remaining + BUILD_CHUNK_SIZE - 1) // BUILD_CHUNK_SIZE
 
@@ -516,24 +636,14 @@ class HelpSearchEngine:
             chunk_num = chunk_start // BUILD_CHUNK_SIZE + 1
 
             self._build_status["phase"] = f"extracting text (chunk {chunk_num}/{total_chunks})"
-            records = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                extraction_results = executor.map(
-                    lambda item: self._extract_text_for_page(item[0], item[1]),
-                    chunk,
-                    chunksize=min(100, max(1, max_workers * 2)),
-                )
-                for result in extraction_results:
-                    records.append(result)
+            records = self._extract_records(chunk)
 
             chunk_data = self._records_to_fts_arrow(records)
 
             self._build_status["phase"] = f"saving (chunk {chunk_num}/{total_chunks})"
-            if not table_created:
-                self.db.create_table(self.TABLE_NAME, chunk_data)
-                table_created = True
+            if table is None:
+                table = self.db.create_table(self.TABLE_NAME, chunk_data)
             else:
-                table = self.db.open_table(self.TABLE_NAME)
                 table.add(chunk_data)
 
             processed = already_done + chunk_start + len(chunk)
@@ -547,16 +657,22 @@ class HelpSearchEngine:
         self._finalize_fts_build(start_time, total_pages)
         self._fts_ready.set()
 
-    def _create_fts_index(self, table) -> None:
-        """Create a Lance native FTS index with configured tokenizer settings."""
+    def _create_search_indexes(self, table) -> None:
+        """Create the Lance native FTS index and the category filter index.
+
+        category_lc holds the lowercased category, so the case-insensitive
+        category filter is a plain equality that a bitmap index (few distinct
+        values) can answer, instead of calling lower() on every candidate row.
+        """
         table.create_fts_index("search_text", replace=True, **self._FTS_CONFIG)
+        table.create_scalar_index("category_lc", index_type="BITMAP", replace=True)
 
     def _finalize_fts_build(self, start_time: float, total_pages: int):
         """Create FTS index and save metadata after text extraction."""
         table = self.db.open_table(self.TABLE_NAME)
         self._build_status["phase"] = "creating FTS index"
         logger.info("Creating FTS index...")
-        self._create_fts_index(table)
+        self._create_search_indexes(table)
 
         self._save_metadata()
         self._clear_build_progress()
@@ -586,11 +702,12 @@ class HelpSearchEngine:
         if resume_ids:
             pages_to_process = [(pid, page) for pid, page in all_pages if pid not in resume_ids]
             already_done = total_pages - len(pages_to_process)
-            table_created = True
+            # One handle for all chunk writes instead of reopening the table per chunk
+            table = self.db.open_table(self.TABLE_NAME)
         else:
             pages_to_process = all_pages
             already_done = 0
-            table_created = False
+            table = None
             try:
                 if self.TABLE_NAME in self.db.list_tables().tables:
                     self.db.drop_table(self.TABLE_NAME)
@@ -616,7 +733,6 @@ class HelpSearchEngine:
 
         self._save_build_progress()
 
-        max_workers = min(int(os.cpu_count() or 4), 20)
         remaining = len(pages_to_process)
         total_chunks = (remaining + BUILD_CHUNK_SIZE - 1) // BUILD_CHUNK_SIZE
         dim = self.embedder.dimension  # type: ignore[union-attr]
@@ -636,26 +752,16 @@ class HelpSearchEngine:
             chunk_num = chunk_start // BUILD_CHUNK_SIZE + 1
 
             self._build_status["phase"] = f"extracting text (chunk {chunk_num}/{total_chunks})"
-            records = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                extraction_results = executor.map(
-                    lambda item: self._extract_text_for_page(item[0], item[1]),
-                    chunk,
-                    chunksize=min(100, max(1, max_workers * 2)),
-                )
-                for result in extraction_results:
-                    records.append(result)
+            records = self._extract_records(chunk)
 
             zero_title_vectors = [[0.0] * dim for _ in records]
             zero_content_vectors = [[0.0] * dim for _ in records]
             chunk_data = self._records_to_hybrid_arrow(records, zero_title_vectors, zero_content_vectors)
 
             self._build_status["phase"] = f"saving text (chunk {chunk_num}/{total_chunks})"
-            if not table_created:
-                self.db.create_table(self.TABLE_NAME, chunk_data)
-                table_created = True
+            if table is None:
+                table = self.db.create_table(self.TABLE_NAME, chunk_data)
             else:
-                table = self.db.open_table(self.TABLE_NAME)
                 table.add(chunk_data)
 
             processed = already_done + chunk_start + len(chunk)
@@ -669,8 +775,9 @@ class HelpSearchEngine:
         # Build FTS index -> keyword search available
         self._build_status["phase"] = "creating FTS index (keyword search)"
         logger.info("Creating FTS index...")
-        table = self.db.open_table(self.TABLE_NAME)
-        self._create_fts_index(table)
+        if table is None:
+            table = self.db.open_table(self.TABLE_NAME)
+        self._create_search_indexes(table)
 
         self._fts_ready.set()
         self._build_status["state"] = "fts_ready"
@@ -690,7 +797,7 @@ class HelpSearchEngine:
         logger.info(f"Phase 2: Embedding {embed_total} pages via API (chunked)...")
         sys.stderr.flush()
 
-        staging_created = False
+        staging = None
         phase2_start = time.time()
 
         for chunk_start in range(0, embed_total, BUILD_CHUNK_SIZE):
@@ -699,15 +806,7 @@ class HelpSearchEngine:
 
             # Re-extract text from HTML (parallel, fast)
             self._build_status["phase"] = f"extracting + embedding (chunk {chunk_num}/{embed_chunks})"
-            records = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                extraction_results = executor.map(
-                    lambda item: self._extract_text_for_page(item[0], item[1]),
-                    chunk,
-                    chunksize=min(100, max(1, max_workers * 2)),
-                )
-                for result in extraction_results:
-                    records.append(result)
+            records = self._extract_records(chunk)
 
             # Embed titles and content in parallel (independent work)
             titles = [f"{r[1]} | {r[6]}" if r[6] else r[1] for r in records]
@@ -750,11 +849,10 @@ class HelpSearchEngine:
 
             # Write chunk to staging table
             chunk_data = self._records_to_hybrid_arrow(records, title_vectors, content_vectors)
-            if not staging_created:
-                self.db.create_table(self.STAGING_TABLE, chunk_data)
-                staging_created = True
+            if staging is None:
+                staging = self.db.create_table(self.STAGING_TABLE, chunk_data)
             else:
-                self.db.open_table(self.STAGING_TABLE).add(chunk_data)
+                staging.add(chunk_data)
 
             # Free memory before next chunk
             del records, title_vectors, content_vectors, chunk_data
@@ -833,7 +931,7 @@ class HelpSearchEngine:
         self._build_status["phase"] = "rebuilding FTS index"
         logger.info("Rebuilding FTS index...")
         table = self.db.open_table(self.TABLE_NAME)
-        self._create_fts_index(table)
+        self._create_search_indexes(table)
         self._fts_ready.set()
         self._build_status["state"] = "fts_ready"
 
@@ -908,17 +1006,8 @@ class HelpSearchEngine:
         if to_upsert:
             self._build_status["phase"] = "extracting text"
             pages_to_index = [(pid, self.indexer.pages[pid]) for pid in to_upsert]
-            max_workers = int(os.cpu_count() or 4)
-
-            records = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                extraction_results = executor.map(
-                    lambda item: self._extract_text_for_page(item[0], item[1]),
-                    pages_to_index,
-                    chunksize=min(100, max(1, max_workers * 2)),
-                )
-                for result in extraction_results:
-                    records.append(result)
+
+            records = self._extract_records(pages_to_index)
 
             logger.info(f"Extracted text for {len(records)} pages")
             self._build_status["pages_processed"] = len(records)
@@ -939,7 +1028,7 @@ class HelpSearchEngine:
         # Rebuild FTS index
         self._build_status["phase"] = "rebuilding FTS index"
         logger.info("Rebuilding FTS index...")
-        self._create_fts_index(table)
+        self._create_search_indexes(table)
 
         self._save_metadata()
 
@@ -948,12 +1037,62 @@ class HelpSearchEngine:
             f"Incremental update complete in {elapsed:.1f}s (+{len(added)} -{len(removed)} ~{len(changed)} pages)"
         )
 
+    def _start_background_optimize(self) -> None:
+        """Compact the freshly written table in a background thread.
+
+        Chunked builds and incremental updates leave many small fragments and
+        dataset versions behind. Compacting them (and folding new rows into the
+        indexes) makes later scans cheaper, but isn't needed for correctness, so
+        it runs after the index is ready instead of delaying it. Searches read
+        the version they opened until the optimize commits, then search()
+        switches to the compacted version; old versions stay on disk until
+        Lance's default 7-day cleanup.
+        """
+
+        # The thread gets the connection and event, not self, so an unclosed engine can still be collected
+        self._table_optimized.clear()
+        self._optimize_thread = threading.Thread(
+            target=self._optimize_table,
+            args=(self.db, self.TABLE_NAME, self._table_optimized),
+            name="lance-optimize",
+            daemon=True,
+        )
+        self._optimize_thread.start()
+
+    @staticmethod
+    def _optimize_table(db, table_name: str, done: threading.Event) -> None:
+        """Compact and re-index one table (runs in the background optimize thread).
+
+        Sets done after a successful commit so searches pick up the new version.
+        """
+        try:
+            start = time.time()
+            db.open_table(table_name).optimize()
+            done.set()
+            logger.info(f"Background index optimize finished in {time.time() - start:.1f}s")
+        except Exception as e:
+            logger.warning(f"Background index optimize failed: {e}")
+
     def _load_index(self):
         """Load existing search index and log stats."""
         table = self.db.open_table(self.TABLE_NAME)
         doc_count = table.count_rows()
         mode = "hybrid" if self._embeddings_enabled else "FTS-only"
         logger.info(f"Loaded search index with {doc_count} documents ({mode})")
+        self._prewarm_indexes(table)
+
+    def _prewarm_indexes(self, table) -> None:
+        """Load the table's indexes into Lance's in-memory index cache.
+
+        Otherwise the first queries after a warm start read the index files
+        from disk piecemeal. Runs in the background initialize() thread, so
+        the cost is paid before the first search rather than during it.
+        """
+        try:
+            for index in table.list_indices():
+                table.prewarm_index(index.name)
+        except Exception as e:
+            logger.warning(f"Index prewarm failed (indexes will load on first search): {e}")
 
     # ------------------------------------------------------------------
     # Search
@@ -965,14 +1104,14 @@ class HelpSearchEngine:
         if not category:
             return None
         safe = re.sub(r"[^\w\s.-]", "", category)
-        return f"lower(category) = '{safe.lower()}'"
+        return f"category_lc = '{safe.lower()}'"
 
     def _vector_search(
         self, table, query_vector: list[float], column_name: str, limit: int, where_clause: str | None
     ) -> list[dict]:
         """Run vector similarity search on a specific column."""
         try:
-            builder = table.search(query_vector, vector_column_name=column_name)
+            builder = table.search(query_vector, vector_column_name=column_name).select(self._RESULT_COLUMNS)
             if where_clause:
                 builder = builder.where(where_clause)
             return builder.limit(limit).to_list()  # type: ignore[no-any-return]
@@ -987,19 +1126,14 @@ class HelpSearchEngine:
         to avoid parse errors.  Reserved boolean keywords (and/or/not) are
         also removed so they don't alter query semantics unexpectedly.
         """
-        sanitized = query
-        for char in "\"'*:(){}^+[]-":
-            sanitized = sanitized.replace(char, " ")
-
-        fts_keywords = {"and", "or", "not", "near"}
-        terms = [t.strip() for t in sanitized.split() if len(t.strip()) >= 2 and t.strip().lower() not in fts_keywords]
+        terms = [t for t in _query_terms(query) if t.lower() not in _FTS_KEYWORDS]
 
         if not terms:
             return []
 
         fts_query = " ".join(terms)
         try:
-            builder = table.search(fts_query, query_type="fts")
+            builder = table.search(fts_query, query_type="fts").select(self._RESULT_COLUMNS)
             if where_clause:
                 builder = builder.where(where_clause)
             return builder.limit(limit).to_list()  # type: ignore[no-any-return]
@@ -1013,10 +1147,7 @@ class HelpSearchEngine:
         if not content:
             return None
 
-        sanitized = query
-        for char in "\"'*:(){}^+[]-":
-            sanitized = sanitized.replace(char, " ")
-        terms = [t for t in sanitized.split() if len(t) >= 2]
+        terms = _query_terms(query)
 
         if terms:
             lower_content = content.lower()
@@ -1032,6 +1163,21 @@ class HelpSearchEngine:
 
         return content[:160] + ("..." if len(content) > 160 else "")
 
+    @staticmethod
+    def _rank_title_matches(page_data: dict[str, dict], query_lower: str) -> list[str]:
+        """Rank pages whose title contains the query: exact matches first, then shorter titles.
+
+        Each title is lowercased once, not once per sort-key evaluation.
+        """
+        matches = []
+        for pid, data in page_data.items():
+            title = data.get("title", "")
+            title_lower = title.lower()
+            if query_lower in title_lower:
+                matches.append((title_lower != query_lower, len(title), pid))
+        matches.sort(key=itemgetter(0, 1))
+        return [pid for _, _, pid in matches]
+
     @staticmethod
     def _apply_breadcrumb_bonus(
         query: str, page_data: dict[str, dict], rrf_scores: dict[str, float], weight: float
@@ -1041,9 +1187,7 @@ class HelpSearchEngine:
         Pages are ranked by how many query terms appear in their breadcrumb,
         with more matches ranked higher.
         """
-        sanitized = query
-        for char in "\"'*:(){}^+[]-/":
-            sanitized = sanitized.replace(char, " ")
+        sanitized = query.translate(_BREADCRUMB_SANITIZE_TABLE)
         terms = [t.lower() for t in sanitized.split() if len(t) >= 2]
         if not terms:
             return
@@ -1076,16 +1220,8 @@ class HelpSearchEngine:
         Requires at least 2 query terms to avoid overly broad single-term matches
         that would add noise to the RRF fusion.
         """
-        sanitized = query
-        for char in "\"'*:(){}^+[]-/":
-            sanitized = sanitized.replace(char, " ")
-
-        fts_keywords = {"and", "or", "not", "near"}
-        terms = [
-            t.strip().lower()
-            for t in sanitized.split()
-            if len(t.strip()) >= 3 and t.strip().lower() not in fts_keywords
-        ]
+        sanitized = query.translate(_BREADCRUMB_SANITIZE_TABLE)
+        terms = [t for t in (t.lower() for t in sanitized.split()) if len(t) >= 3 and t not in _FTS_KEYWORDS]
 
         # Require at least 2 terms — single-term breadcrumb matches are too broad
         # (e.g. "ACP10" alone matches 200+ pages, just adding noise)
@@ -1108,7 +1244,9 @@ class HelpSearchEngine:
         try:
             # Use a generous scan limit since AND filter is narrow
             scan_limit = max(limit * 5, 200)
-            raw_results: list[dict] = table.search().where(combined_filter).limit(scan_limit).to_list()
+            raw_results: list[dict] = (
+                table.search().select(self._RESULT_COLUMNS).where(combined_filter).limit(scan_limit).to_list()
+            )
 
             if not raw_results:
                 return []
@@ -1135,33 +1273,45 @@ class HelpSearchEngine:
         """
         if not query.strip():
             return []
-
-        try:
-            table = self.db.open_table(self.TABLE_NAME)
-        except Exception:
-            # Table may be temporarily unavailable during Phase 2 table swap
-            if not self._fts_ready.is_set():
-                return []
-            raise
+        # Keep limit a sane int; it sizes every leg's fetch (limit * 3, capped at 100)
+        limit = max(1, min(int(limit), 1000))
+
+        cache_key = (query.strip(), limit, bool(search_in_content), category.lower() if category else "")
+        if self.ready:
+            with self._result_cache_lock:
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    self._result_cache.move_to_end(cache_key)
+                    return [dict(r) for r in cached]
+
+        if self._table_optimized.is_set():
+            # The pinned handle stays on its version; reopen to read the compacted table and indexes
+            self._table_optimized.clear()
+            self._search_table = None
+        table = self._search_table
+        if table is None:
+            try:
+                table = self.db.open_table(self.TABLE_NAME)
+            except Exception:
+                # Table may be temporarily unavailable during Phase 2 table swap
+                if not self._fts_ready.is_set():
+                    return []
+                raise
+            # Once ready the data no longer changes, so the handle (and its cached
+            # manifest and index metadata) can be kept; only the background
+            # optimize commits a newer version, handled above
+            if self.ready:
+                self._search_table = table
         where_clause = self._build_category_filter(category)
 
         # Use vectors only when embeddings are enabled AND index is fully ready
         use_vectors = self._embeddings_enabled and self.ready
 
         # Choose RRF weights based on query type
-        is_identifier = _is_identifier_query(query)
-        if is_identifier:
-            w_title_vec = WEIGHT_TITLE_VECTOR_ID
-            w_content_vec = WEIGHT_CONTENT_VECTOR_ID
-            w_fts = WEIGHT_FTS_KEYWORD_ID
-            w_title_match = WEIGHT_TITLE_MATCH_ID
-            w_breadcrumb = WEIGHT_BREADCRUMB_MATCH_ID
-        else:
-            w_title_vec = WEIGHT_TITLE_VECTOR
-            w_content_vec = WEIGHT_CONTENT_VECTOR
-            w_fts = WEIGHT_FTS_KEYWORD
-            w_title_match = WEIGHT_TITLE_MATCH
-            w_breadcrumb = WEIGHT_BREADCRUMB_MATCH
+        w_title_vec, w_content_vec, w_fts, w_title_match, w_breadcrumb = (
+            _RRF_WEIGHTS_ID if _is_identifier_query(query) else _RRF_WEIGHTS
+        )
+        query_lower = query.strip().lower()
 
         if use_vectors:
             try:
@@ -1202,15 +1352,7 @@ class HelpSearchEngine:
                     page_data[pid] = row
 
             # 4th leg: title exact / substring match bonus
-            query_lower = query.strip().lower()
-            title_match_candidates = sorted(
-                [(pid, data) for pid, data in page_data.items() if query_lower in data.get("title", "").lower()],
-                key=lambda x: (
-                    x[1].get("title", "").lower() != query_lower,  # exact match first
-                    len(x[1].get("title", "")),  # shorter titles first
-                ),
-            )
-            for rank, (pid, _data) in enumerate(title_match_candidates):
+            for rank, pid in enumerate(self._rank_title_matches(page_data, query_lower)):
                 rrf_scores[pid] = rrf_scores.get(pid, 0.0) + w_title_match / (RRF_K + rank + 1)
 
             # 5th leg: breadcrumb retrieval — pulls pages by breadcrumb match
@@ -1222,7 +1364,7 @@ class HelpSearchEngine:
                 if pid not in page_data:
                     page_data[pid] = row
 
-            sorted_ids = sorted(rrf_scores.keys(), key=lambda pid: rrf_scores[pid], reverse=True)[:limit]
+            sorted_ids = heapq.nlargest(limit, rrf_scores, key=rrf_scores.__getitem__)
             search_mode = "hybrid"
         else:
             # Over-fetch to allow reranking (same approach as hybrid mode)
@@ -1237,15 +1379,7 @@ class HelpSearchEngine:
                 page_data[pid] = row
 
             # Title match bonus in keyword mode too
-            query_lower = query.strip().lower()
-            title_match_candidates = sorted(
-                [(pid, data) for pid, data in page_data.items() if query_lower in data.get("title", "").lower()],
-                key=lambda x: (
-                    x[1].get("title", "").lower() != query_lower,
-                    len(x[1].get("title", "")),
-                ),
-            )
-            for rank, (pid, _data) in enumerate(title_match_candidates):
+            for rank, pid in enumerate(self._rank_title_matches(page_data, query_lower)):
                 rrf_scores[pid] = rrf_scores.get(pid, 0.0) + w_title_match / (RRF_K + rank + 1)
 
             # Breadcrumb retrieval in keyword mode too
@@ -1256,29 +1390,36 @@ class HelpSearchEngine:
                 if pid not in page_data:
                     page_data[pid] = row
 
-            sorted_ids = sorted(rrf_scores.keys(), key=lambda pid: rrf_scores[pid], reverse=True)[:limit]
+            sorted_ids = heapq.nlargest(limit, rrf_scores, key=rrf_scores.__getitem__)
             search_mode = "keyword"
 
+        # Every leg selects _RESULT_COLUMNS, so rows can be indexed directly
         results = []
         for pid in sorted_ids:
             row = page_data[pid]
-            snippet = self._generate_snippet(row.get("content", ""), query)
             results.append(
                 {
                     "page_id": pid,
-                    "title": row.get("title", ""),
-                    "file_path": row.get("file_path", ""),
-                    "help_id": row.get("help_id") or None,
-                    "is_section": bool(row.get("is_section", 0)),
-                    "breadcrumb_path": row.get("breadcrumb_path") or None,
-                    "category": row.get("category") or None,
+                    "title": row["title"],
+                    "file_path": row["file_path"],
+                    "help_id": row["help_id"] or None,
+                    "is_section": bool(row["is_section"]),
+                    "breadcrumb_path": row["breadcrumb_path"] or None,
+                    "category": row["category"] or None,
                     "score": rrf_scores[pid],
-                    "snippet": snippet,
+                    "snippet": self._generate_snippet(row["content"], query),
                     "search_mode": search_mode,
                 }
             )
 
         logger.info(f"Search for '{query}' (cat={category}, mode={search_mode}) returned {len(results)} results")
+
+        # Skip caching keyword fallbacks after an embedding error so the next call retries hybrid
+        if self.ready and use_vectors == self._embeddings_enabled:
+            with self._result_cache_lock:
+                self._result_cache[cache_key] = tuple(dict(r) for r in results)
+                if len(self._result_cache) > SEARCH_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
         return results
 
     # ------------------------------------------------------------------
@@ -1286,16 +1427,14 @@ class HelpSearchEngine:
     # ------------------------------------------------------------------
 
     def _has_resumable_build(self) -> bool:
-        if not self._build_progress_path.exists():
-            return False
         try:
+            with open(self._build_progress_path) as f:
+                progress = json.load(f)
             if self.TABLE_NAME not in self.db.list_tables().tables:
                 return False
             table = self.db.open_table(self.TABLE_NAME)
             if table.count_rows() == 0:
                 return False
-            with open(self._build_progress_path) as f:
-                progress = json.load(f)
             # Match XML hash and embedding mode
             if progress.get("xml_hash") != self.indexer._get_xml_hash():
                 return False
@@ -1319,8 +1458,7 @@ class HelpSearchEngine:
             json.dump(progress, f)
 
     def _clear_build_progress(self):
-        if self._build_progress_path.exists():
-            self._build_progress_path.unlink()
+        self._build_progress_path.unlink(missing_ok=True)
 
     def _get_indexed_page_ids(self) -> set[str]:
         try:
@@ -1389,21 +1527,19 @@ class HelpSearchEngine:
         self._instance_lock_owned = True
         logger.info("Acquired instance lock for %s (PID %s)", self.db_path, os.getpid())
 
-    def _release_instance_lock(self):
-        if not self._instance_lock_owned:
-            return
+    @staticmethod
+    def _release_resources(lock_path: Path, resolved_db_path: str, embedder: "EmbeddingService | None") -> None:
         try:
-            self._instance_lock_path.unlink(missing_ok=True)
+            lock_path.unlink(missing_ok=True)
         except OSError:
             pass
-        try:
-            resolved = str(self.db_path.resolve())
-            with self._active_db_paths_lock:
-                self._active_db_paths.discard(resolved)
-        except Exception:
-            pass
-        finally:
-            self._instance_lock_owned = False
+        with HelpSearchEngine._active_db_paths_lock:
+            HelpSearchEngine._active_db_paths.discard(resolved_db_path)
+        if embedder is not None and hasattr(embedder, "close"):
+            try:
+                embedder.close()
+            except Exception:
+                pass
 
     def _read_instance_lock(self) -> dict | None:
         try:
@@ -1507,13 +1643,17 @@ class HelpSearchEngine:
 
     def close(self):
         """Close database connection and release instance lock."""
-        self._release_instance_lock()
-        if self.embedder is not None and hasattr(self.embedder, "close"):
-            try:
-                self.embedder.close()
-            except Exception:
-                pass
+        # Give a running optimize a moment to commit; a long compaction must not block shutdown.
+        # Lance commits atomically, so an optimize cut short by process exit leaves the last version intact.
+        if self._optimize_thread is not None:
+            self._optimize_thread.join(timeout=OPTIMIZE_JOIN_TIMEOUT)
+            if self._optimize_thread.is_alive():
+                logger.warning(
+                    f"Background index optimize still running after {OPTIMIZE_JOIN_TIMEOUT:.0f}s; "
+                    "not waiting for it to finish"
+                )
+            self._optimize_thread = None
+        self._finalizer()
+        self._instance_lock_owned = False
+        self._search_table = None
         self.db = None
-
-    def __del__(self):
-        self.close()
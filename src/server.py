@@ -7,23 +7,28 @@ Optimized for thousands of help files with persistent indexing and fast startup.
 import asyncio
 import logging
 import os
-from argparse import ArgumentTypeError
+from argparse import ArgumentParser, ArgumentTypeError
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, cast
+from typing import Annotated, Literal, cast
+from urllib.parse import quote
 
 from dotenv import load_dotenv
 from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
 from pydantic import BaseModel, Field
 
-from src.indexer import HelpContentIndexer
+from src.indexer import HelpContentIndexer, HelpPage
 from src.search_engine import HelpSearchEngine
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Upper bound for get_pages_by_ids so one call cannot pull the whole help tree
+MAX_PAGES_PER_REQUEST = 10
+
 
 def get_as_version_config() -> tuple[str, str]:
     """Get Automation Studio version from environment variable.
@@ -41,15 +46,16 @@ def get_as_version_config() -> tuple[str, str]:
     return "4", "https://help.br-automation.com/#/en/4/"
 
 
+@lru_cache(maxsize=4096)
 def _build_online_help_url(base_url: str, file_path: str | None) -> str | None:
     """Build normalized online help URL from a relative file path.
 
     Percent-encodes special characters (parentheses, spaces, etc.) in each
-    path segment while preserving the '/' separators.
+    path segment while preserving the '/' separators. Memoized because the
+    same pages recur across searches and page retrievals.
     """
     if not file_path:
         return None
-    from urllib.parse import quote
 
     normalized_path = file_path.replace("\\", "/")
     # Encode each path segment individually to preserve '/' separators
@@ -178,6 +184,26 @@ class AppContext:
     online_help_base_url: str  # Base URL for online help links
 
 
+def _build_page_content(
+    app_ctx: AppContext, page: HelpPage, include_html: bool, include_text: bool, include_breadcrumb: bool
+) -> PageContent:
+    """Assemble the PageContent response for a resolved help page."""
+    html_content = app_ctx.indexer.extract_html_content(page.id) if include_html else None
+    plain_text = app_ctx.indexer.extract_plain_text(page.id) if include_text else None
+    breadcrumb = [p.text for p in app_ctx.indexer.get_breadcrumb(page.id)] if include_breadcrumb else []
+
+    return PageContent.model_construct(
+        page_id=page.id,
+        title=page.text,
+        file_path=page.file_path,
+        online_help_url=_build_online_help_url(app_ctx.online_help_base_url, page.file_path),
+        help_id=page.help_id,
+        html_content=html_content,
+        plain_text=plain_text,
+        breadcrumb=breadcrumb,
+    )
+
+
 @asynccontextmanager
 async def app_lifespan(server: FastMCP):
     """Manage application lifecycle - load and index help content on startup."""
@@ -198,6 +224,10 @@ async def app_lifespan(server: FastMCP):
     # Check if force rebuild is requested
     force_rebuild = os.getenv("AS_HELP_FORCE_REBUILD", "false").lower() == "true"
 
+    # brhelpcontent.xml comes from the local AS installation, so the faster lxml parser is the
+    # default; set false to parse it with defusedxml instead
+    trusted_xml = os.getenv("AS_HELP_TRUSTED_XML", "true").lower() == "true"
+
     # Get metadata directory (separate from help root for read-only mounts)
     # Default to /data/db for Docker volumes (not help root for read-only compatibility)
     if help_root.startswith("/data/"):
@@ -218,10 +248,11 @@ async def app_lifespan(server: FastMCP):
     logger.info(f"Database: {db_path}")
     logger.info(f"Metadata dir: {metadata_path}")
     logger.info(f"Force rebuild: {force_rebuild}")
+    logger.info(f"XML parser: {'lxml' if trusted_xml else 'defusedxml'}")
 
     # Initialize indexer (parses XML structure)
     logger.info("Initializing help indexer...")
-    indexer = HelpContentIndexer(help_root_path, metadata_dir=metadata_path)
+    indexer = HelpContentIndexer(help_root_path, metadata_dir=metadata_path, trusted_xml=trusted_xml)
     indexer.parse_xml_structure()
 
     # Log available top-level categories
@@ -299,7 +330,8 @@ async def app_lifespan(server: FastMCP):
     except Exception as exc:
         logger.debug("Background index thread raised an exception during teardown: %s", exc)
 
-    search_engine.close()
+    # close() may wait briefly for a background optimize; keep that off the event loop
+    await asyncio.to_thread(search_engine.close)
     logger.info("Shutting down help server")
 
 
@@ -313,7 +345,8 @@ mcp = FastMCP(  # pragma: no cover
         "*** RESEARCH WORKFLOW ***\n\n"  # pragma: no cover
         "1. search_help — Find pages by keyword or meaning. Returns titles/page_ids only, NO content.\n"  # pragma: no cover
         "2. get_page_by_id — Get FULL content. Use breadcrumb_path from results to pick relevant pages "  # pragma: no cover
-        "and skip obvious mismatches (e.g., wrong library variant).\n"  # pragma: no cover
+        "and skip obvious mismatches (e.g., wrong library variant). "  # pragma: no cover
+        "Use get_pages_by_ids to read several results in one call.\n"  # pragma: no cover
         "3. REPEAT — Search with different keywords or synonyms. Complex questions need 2-5 page retrievals.\n"  # pragma: no cover
         "4. get_page_by_help_id — Use when you have a numeric HelpID (e.g., from error codes or context help).\n\n"  # pragma: no cover
         "*** DISCOVERY & BROWSING ***\n\n"  # pragma: no cover
@@ -330,7 +363,7 @@ mcp = FastMCP(  # pragma: no cover
 
 
 @mcp.tool()
-def search_help(
+async def search_help(
     ctx: Context,
     query: str = Field(
         description="Search query — use specific identifiers (e.g., 'MC_BR_MoveAbsolute') or natural language (e.g., 'how to move an axis'). Try different keywords for better coverage."
@@ -382,7 +415,7 @@ def search_help(
             )
 
         logger.info(f"Search called while building: {msg}")
-        return SearchResults(query=query, results=[], total=0, status_message=msg)
+        return SearchResults.model_construct(query=query, results=[], total=0, status_message=msg)
 
     # Handle FieldInfo objects when function called directly (not through FastMCP framework)
     # This supports both MCP tool invocation and direct test calls
@@ -395,12 +428,19 @@ def search_help(
     if isinstance(category, FieldInfo):
         category = category.default
 
-    # Perform search (returns breadcrumb_path directly from LanceDB index)
-    results = app_ctx.search_engine.search(
-        query=query, limit=limit, search_in_content=content_search, category=category
+    # Perform search (returns breadcrumb_path directly from LanceDB index).
+    # Query embedding and LanceDB scans block, so run them in a worker thread to keep
+    # the event loop free for concurrent tool calls.
+    results = await asyncio.to_thread(
+        app_ctx.search_engine.search,
+        query=query,
+        limit=limit,
+        search_in_content=content_search,
+        category=category,
     )
 
-    # Convert to SearchResult models
+    # Convert to SearchResult models. Output is built from index data that is already
+    # well-typed, so model_construct skips Pydantic validation on every response model.
     search_results = []
     for r in results:
         # Use snippet precomputed by search engine to avoid extra disk I/O per result.
@@ -413,7 +453,7 @@ def search_help(
         # Build online help URL from file path
         online_help_url = _build_online_help_url(app_ctx.online_help_base_url, r.get("file_path"))
 
-        result = SearchResult(
+        result = SearchResult.model_construct(
             page_id=r["page_id"],
             title=r["title"],
             file_path=r["file_path"],
@@ -444,7 +484,7 @@ def search_help(
             "Semantic search is still loading — results are keyword-only. Retry later for better relevance ranking."
         )
 
-    return SearchResults(
+    return SearchResults.model_construct(
         query=query,
         results=search_results,
         total=len(search_results),
@@ -470,10 +510,10 @@ def get_categories(ctx: Context) -> CategoriesResult:
     categories = app_ctx.indexer.get_top_level_categories()
 
     category_results = [
-        CategoryInfo(id=cat["id"], title=cat["title"], file_path=cat["file_path"]) for cat in categories
+        CategoryInfo.model_construct(id=cat["id"], title=cat["title"], file_path=cat["file_path"]) for cat in categories
     ]
 
-    return CategoriesResult(categories=category_results, total=len(category_results))
+    return CategoriesResult.model_construct(categories=category_results, total=len(category_results))
 
 
 @mcp.tool()
@@ -501,17 +541,19 @@ def browse_section(
     children = app_ctx.indexer.get_section_children(section_id)
 
     child_results = [
-        SectionChild(id=child["id"], title=child["title"], file_path=child["file_path"], is_section=child["is_section"])
+        SectionChild.model_construct(
+            id=child["id"], title=child["title"], file_path=child["file_path"], is_section=child["is_section"]
+        )
         for child in children
     ]
 
-    return SectionChildren(
+    return SectionChildren.model_construct(
         section_id=section_id, section_title=parent.text, children=child_results, total=len(child_results)
     )
 
 
 @mcp.tool()
-def get_page_by_id(
+async def get_page_by_id(
     ctx: Context,
     page_id: str = Field(description="Page ID from search results."),
     include_html: bool = Field(
@@ -534,37 +576,42 @@ def get_page_by_id(
     if not page:
         return None
 
-    html_content = None
-    plain_text = None
-    breadcrumb = []
+    # File reads and HTML parsing block, so keep them off the event loop
+    return await asyncio.to_thread(_build_page_content, app_ctx, page, include_html, include_text, include_breadcrumb)
 
-    if include_html:
-        html_content = app_ctx.indexer.extract_html_content(page_id)
 
-    if include_text:
-        plain_text = app_ctx.indexer.extract_plain_text(page_id)
+@mcp.tool()
+async def get_pages_by_ids(
+    ctx: Context,
+    page_ids: Annotated[
+        list[str],
+        Field(description="Page IDs from search results (up to 10).", max_length=MAX_PAGES_PER_REQUEST),
+    ],
+    include_html: bool = Field(
+        default=False, description="Include raw HTML (only needed for rendering or link extraction)."
+    ),
+    include_text: bool = Field(default=True, description="Include full plain text content."),
+    include_breadcrumb: bool = Field(default=True, description="Include navigation breadcrumb path."),
+) -> list[PageContent | None]:
+    """Get the COMPLETE content of several help pages in one call.
 
-    if include_breadcrumb:
-        breadcrumb_pages = app_ctx.indexer.get_breadcrumb(page_id)
-        breadcrumb = [p.text for p in breadcrumb_pages]
+    Same content as get_page_by_id, returned in the order of page_ids (None for unknown IDs).
+    Prefer this over repeated get_page_by_id calls when reading the top 3-5 search results.
+    """
+    app_ctx: AppContext = ctx.request_context.lifespan_context
 
-    # Build online help URL
-    online_help_url = _build_online_help_url(app_ctx.online_help_base_url, page.file_path)
+    def load(page_id: str) -> PageContent | None:
+        page = app_ctx.indexer.get_page_by_id(page_id)
+        if not page:
+            return None
+        return _build_page_content(app_ctx, page, include_html, include_text, include_breadcrumb)
 
-    return PageContent(
-        page_id=page.id,
-        title=page.text,
-        file_path=page.file_path,
-        online_help_url=online_help_url,
-        help_id=page.help_id,
-        html_content=html_content,
-        plain_text=plain_text,
-        breadcrumb=breadcrumb,
-    )
+    # Pages are read and parsed in worker threads so file I/O overlaps and the event loop stays free
+    return list(await asyncio.gather(*(asyncio.to_thread(load, page_id) for page_id in page_ids)))
 
 
 @mcp.tool()
-def get_page_by_help_id(
+async def get_page_by_help_id(
     ctx: Context,
     help_id: str = Field(
         description="Numeric HelpID value (e.g., '3002099'). Found in error messages, context help, and AS project references."
@@ -584,33 +631,7 @@ def get_page_by_help_id(
     if not page:
         return None
 
-    html_content = None
-    plain_text = None
-    breadcrumb = []
-
-    if include_html:
-        html_content = app_ctx.indexer.extract_html_content(page.id)
-
-    if include_text:
-        plain_text = app_ctx.indexer.extract_plain_text(page.id)
-
-    if include_breadcrumb:
-        breadcrumb_pages = app_ctx.indexer.get_breadcrumb(page.id)
-        breadcrumb = [p.text for p in breadcrumb_pages]
-
-    # Build online help URL
-    online_help_url = _build_online_help_url(app_ctx.online_help_base_url, page.file_path)
-
-    return PageContent(
-        page_id=page.id,
-        title=page.text,
-        file_path=page.file_path,
-        online_help_url=online_help_url,
-        help_id=page.help_id,
-        html_content=html_content,
-        plain_text=plain_text,
-        breadcrumb=breadcrumb,
-    )
+    return await asyncio.to_thread(_build_page_content, app_ctx, page, include_html, include_text, include_breadcrumb)
 
 
 @mcp.tool()
@@ -635,7 +656,7 @@ async def get_breadcrumb(
     breadcrumb_pages = app_ctx.indexer.get_breadcrumb(page_id)
 
     result = [
-        BreadcrumbItem(page_id=p.id, title=p.text, file_path=p.file_path, is_section=p.is_section)
+        BreadcrumbItem.model_construct(page_id=p.id, title=p.text, file_path=p.file_path, is_section=p.is_section)
         for p in breadcrumb_pages
     ]
 
@@ -655,30 +676,23 @@ async def get_help_statistics(ctx: Context) -> dict:
     """
     app_ctx: AppContext = ctx.request_context.lifespan_context
 
-    total_pages = len(app_ctx.indexer.pages)
-    total_sections = sum(1 for p in app_ctx.indexer.pages.values() if p.is_section)
-    total_help_ids = len(app_ctx.indexer.help_id_map)
-
-    # Check parent-child relationships
-    pages_with_parents = sum(1 for p in app_ctx.indexer.pages.values() if p.parent_id is not None)
-    root_pages = sum(1 for p in app_ctx.indexer.pages.values() if p.parent_id is None)
+    # Counts are computed once when the help structure is loaded
+    structure = app_ctx.indexer.get_structure_stats()
 
     # Get index build status
     build_status = app_ctx.search_engine.build_status
 
-    await ctx.info(f"Statistics: {total_pages} total, {total_sections} sections, {total_help_ids} HelpIDs")
-    await ctx.info(f"Hierarchy: {pages_with_parents} with parents, {root_pages} root items")
+    await ctx.info(
+        f"Statistics: {structure['total_pages']} total, {structure['total_sections']} sections, "
+        f"{structure['help_id_mappings']} HelpIDs"
+    )
+    await ctx.info(f"Hierarchy: {structure['pages_with_parents']} with parents, {structure['root_items']} root items")
     await ctx.info(
         f"Index: state={build_status['state']}, type={build_status['build_type']}, phase={build_status['phase']}"
     )
 
     result: dict = {
-        "total_pages": total_pages,
-        "total_sections": total_sections,
-        "regular_pages": total_pages - total_sections,
-        "help_id_mappings": total_help_ids,
-        "pages_with_parents": pages_with_parents,
-        "root_items": root_pages,
+        **structure,
         "index_status": {
             "state": build_status["state"],
             "build_type": build_status["build_type"],
@@ -689,6 +703,9 @@ async def get_help_statistics(ctx: Context) -> dict:
         },
     }
 
+    # Page content cache effectiveness (get_page_by_id / get_page_by_help_id)
+    result["content_cache"] = app_ctx.indexer.content_cache_info()
+
     # Include incremental stats when available
     if build_status.get("incremental_stats"):
         result["index_status"]["incremental_stats"] = build_status["incremental_stats"]
@@ -713,7 +730,7 @@ def help_search(topic: str) -> str:
 
 1. Use the `search_help` tool to find all relevant pages (use limit=10 for comprehensive results)
 2. If the first search doesn't cover all aspects, search with alternative keywords or related terms
-3. Use the `get_page_by_id` tool to retreive full content for the content summary.
+3. Use the `get_pages_by_ids` tool to retrieve full content of the relevant pages in one call for the content summary.
 4. For each relevant result, extract and present the following information:
 
 ## Required Output Format
@@ -769,9 +786,9 @@ def help_details(topic: str) -> str:
 ## Research Workflow
 
 1. **Initial Search**: Use `search_help` with limit=10 to find all relevant pages
-2. **Retrieve Content**: Call `get_page_by_id` for the TOP 3-5 most relevant results
+2. **Retrieve Content**: Call `get_pages_by_ids` once with the TOP 3-5 most relevant page IDs
 3. **Expand Search**: Search for related terms (e.g., if topic is a function block, also search for its error codes, examples, related FBs)
-4. **Retrieve More**: Call `get_page_by_id` for additional relevant pages found
+4. **Retrieve More**: Call `get_pages_by_ids` for additional relevant pages found
 5. **Synthesize**: Combine information from ALL retrieved pages into a comprehensive answer
 
 ## Required Research Depth
@@ -808,7 +825,7 @@ List all pages consulted:
 ## Guidelines
 
 - DO NOT answer from search previews - they are truncated and insufficient
-- ALWAYS call get_page_by_id multiple times to read actual content
+- ALWAYS retrieve several pages (get_pages_by_ids) to read actual content
 - If the first search doesn't find what you need, try alternative keywords
 - Prioritize official function block documentation, then examples, then general guides
 - Include Online Help URLs so the user can read more themselves
@@ -818,9 +835,12 @@ Now perform deep research on "{topic}" and provide a comprehensive, well-sourced
 
 def main():
     """Entry point for the MCP server."""
-    import argparse
+    import multiprocessing
+
+    # Frozen (PyInstaller) builds: let spawned text-extraction workers run their task instead of main()
+    multiprocessing.freeze_support()
 
-    parser = argparse.ArgumentParser(description="B&R Automation Studio Help MCP Server")
+    parser = ArgumentParser(description="B&R Automation Studio Help MCP Server")
     parser.add_argument(
         "--help-root",
         help="Path to AS Help Data folder (AS_HELP_ROOT). Example: 'C:\\BRAutomation\\AS412\\Help-en\\Data'",
@@ -856,23 +876,36 @@ def main():
         metavar="BOOL",
         help="Enable embedding via API: true/false (CREATE_EMBEDDINGS). Omit value for true.",
     )
+    parser.add_argument(
+        "--trusted-xml",
+        type=_parse_bool_arg,
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="BOOL",
+        help="Parse brhelpcontent.xml with lxml; false uses defusedxml (AS_HELP_TRUSTED_XML). Default: true",
+    )
     parser.add_argument("--usage", action="store_true", help="Print usage examples and exit")
 
     # Parse known args to allow them to be passed before or after FastMCP args
     args, _ = parser.parse_known_args()
 
+    # abspath is enough to pin relative paths to the launch directory; symlinks
+    # are resolved once in app_lifespan, so don't stat the paths here as well
     if args.help_root:
-        os.environ["AS_HELP_ROOT"] = str(Path(args.help_root).resolve())
+        os.environ["AS_HELP_ROOT"] = os.path.abspath(args.help_root)
     if args.db_path:
-        os.environ["AS_HELP_DB_PATH"] = str(Path(args.db_path).resolve())
+        os.environ["AS_HELP_DB_PATH"] = os.path.abspath(args.db_path)
     if args.metadata_dir:
-        os.environ["AS_HELP_METADATA_DIR"] = str(Path(args.metadata_dir).resolve())
+        os.environ["AS_HELP_METADATA_DIR"] = os.path.abspath(args.metadata_dir)
     if args.force_rebuild is not None:
         os.environ["AS_HELP_FORCE_REBUILD"] = "true" if args.force_rebuild else "false"
     if args.as_version:
         os.environ["AS_HELP_VERSION"] = args.as_version
     if args.create_embeddings is not None:
         os.environ["CREATE_EMBEDDINGS"] = "true" if args.create_embeddings else "false"
+    if args.trusted_xml is not None:
+        os.environ["AS_HELP_TRUSTED_XML"] = "true" if args.trusted_xml else "false"
 
     # Run with stdio transport by default (for local MCP clients like Claude Desktop)
     # To expose over HTTP, set MCP_TRANSPORT=streamable-http and configure host/port with MCP_HOST/MCP_PORT
@@ -2,11 +2,14 @@
 
 import hashlib
 import xml.etree.ElementTree as ET
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 
 from src.indexer import HelpContentIndexer, HelpPage
+from src.search_engine import HelpSearchEngine
+from src.server import AppContext
 
 
 class MockEmbeddingService:
@@ -168,7 +171,7 @@ def sample_xml_abbreviated(temp_help_dir):
 @pytest.fixture
 def mock_indexer():
     """Create indexer with in-memory test data (no file system)."""
-    indexer = MagicMock(spec=HelpContentIndexer)
+    indexer = Mock(spec=HelpContentIndexer)
 
     # Create sample pages
     page1 = HelpPage(
@@ -189,9 +192,56 @@ def mock_indexer():
     indexer.get_breadcrumb = lambda pid: indexer._breadcrumb_cache.get(pid, [])
     indexer.get_breadcrumb_string = lambda pid: " > ".join(p.text for p in indexer.get_breadcrumb(pid))
 
+    def structure_stats():
+        # Run the real counting code over the mock's current pages and HelpIDs
+        HelpContentIndexer._compute_structure_stats(indexer)
+        return HelpContentIndexer.get_structure_stats(indexer)
+
+    indexer.get_structure_stats.side_effect = structure_stats
+
     return indexer
 
 
+@pytest.fixture
+def mock_search_engine():
+    """Create a ready search engine stub that returns no results."""
+    engine = Mock(spec=HelpSearchEngine)
+    engine._embeddings_enabled = False
+    engine.build_status = {
+        "state": "ready",
+        "build_type": "none",
+        "phase": "complete",
+        "pages_total": 3,
+        "pages_processed": 3,
+        "elapsed_seconds": 0.5,
+        "incremental_stats": None,
+        "error": None,
+    }
+    engine.search.return_value = []
+    return engine
+
+
+async def _noop_log(*args, **kwargs):
+    """Stand-in for the async Context logging methods."""
+
+
+@pytest.fixture
+def mock_context(mock_indexer, mock_search_engine):
+    """Create an MCP context whose lifespan context wraps the mock indexer and search engine."""
+    app_context = AppContext(
+        indexer=mock_indexer,
+        search_engine=mock_search_engine,
+        as_version="4",
+        online_help_base_url="https://help.br-automation.com/#/en/4/",
+    )
+    # Tools only read ctx.request_context.lifespan_context and await the logging methods
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=app_context),
+        info=_noop_log,
+        warning=_noop_log,
+    )
+
+
 @pytest.fixture
 def initialized_indexer(sample_xml):
     """Create a fully initialized indexer with parsed content."""
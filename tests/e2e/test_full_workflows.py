@@ -40,10 +40,11 @@ class TestEndToEnd:
 
         search_engine.close()
 
-    def test_full_search_workflow(self, help_server):
+    @pytest.mark.asyncio
+    async def test_full_search_workflow(self, help_server):
         """Test: search -> get results -> retrieve page content."""
         # 1. Call search_help with query
-        search_results = search_help(help_server, query="X20DI9371")
+        search_results = await search_help(help_server, query="X20DI9371")
 
         # 2. Verify results contain expected pages
         assert search_results.total > 0
@@ -51,7 +52,7 @@ class TestEndToEnd:
 
         # 3. Call get_page_by_id for top result
         top_result = search_results.results[0]
-        page_content = get_page_by_id(page_id=top_result.page_id, ctx=help_server)
+        page_content = await get_page_by_id(page_id=top_result.page_id, ctx=help_server)
 
         # 4. Verify page content is returned
         assert page_content is not None
@@ -59,7 +60,8 @@ class TestEndToEnd:
         assert page_content.plain_text is not None
         assert len(page_content.plain_text) > 0
 
-    def test_category_navigation_workflow(self, help_server):
+    @pytest.mark.asyncio
+    async def test_category_navigation_workflow(self, help_server):
         """Test: get_categories -> browse_section -> get_page_by_id."""
         # 1. Call get_categories
         categories = get_categories(help_server)
@@ -81,24 +83,26 @@ class TestEndToEnd:
         # 5. Get a page from children
         page_child = next((c for c in hardware_children.children if not c.is_section), None)
         if page_child:
-            page_content = get_page_by_id(page_id=page_child.id, ctx=help_server)
+            page_content = await get_page_by_id(page_id=page_child.id, ctx=help_server)
             assert page_content is not None
 
-    def test_help_id_lookup_workflow(self, help_server):
+    @pytest.mark.asyncio
+    async def test_help_id_lookup_workflow(self, help_server):
         """Test: get_page_by_help_id returns correct page."""
         # 1. Call get_page_by_help_id with known HelpID
-        page_content = get_page_by_help_id(help_server, help_id="12345")
+        page_content = await get_page_by_help_id(help_server, help_id="12345")
 
         # 2. Verify correct page is returned
         assert page_content is not None
         assert page_content.title == "X20DI9371"
         assert page_content.help_id == "12345"
 
-    def test_breadcrumb_accuracy(self, help_server):
+    @pytest.mark.asyncio
+    async def test_breadcrumb_accuracy(self, help_server):
         """Test: breadcrumb correctly represents hierarchy."""
         # 1. Get page at motion/mapp_motion/mc_br_moveabsolute.html
         page_id = "mc_moveabs_page"
-        page_content = get_page_by_id(page_id=page_id, include_breadcrumb=True, ctx=help_server)
+        page_content = await get_page_by_id(page_id=page_id, include_breadcrumb=True, ctx=help_server)
 
         # 2. Verify breadcrumb is correct
         assert page_content is not None
@@ -107,10 +111,11 @@ class TestEndToEnd:
         assert page_content.breadcrumb[1] == "mapp Motion"
         assert page_content.breadcrumb[2] == "MC_BR_MoveAbsolute"
 
-    def test_incremental_reindex(self, help_server, temp_help_dir, tmp_path, mock_embedding_service):
+    @pytest.mark.asyncio
+    async def test_incremental_reindex(self, help_server, temp_help_dir, tmp_path, mock_embedding_service):
         """Test: modifying XML triggers reindex."""
         # 1. Verify initial index works
-        initial_results = search_help(help_server, query="motion")
+        initial_results = await search_help(help_server, query="motion")
         assert initial_results.total > 0
 
         # 2. Modify brhelpcontent.xml (add new page)
@@ -150,7 +155,7 @@ class TestEndToEnd:
         ctx = MagicMock()
         ctx.request_context.lifespan_context = app_context
 
-        results = search_help(ctx, query="New Test Page")
+        results = await search_help(ctx, query="New Test Page")
         assert results.total > 0
         assert any("New Test Page" in r.title for r in results.results)
 
@@ -184,14 +189,15 @@ class TestCompleteUserJourneys:
 
         search_engine.close()
 
-    def test_hardware_specialist_journey(self, help_server):
+    @pytest.mark.asyncio
+    async def test_hardware_specialist_journey(self, help_server):
         """Simulate a hardware specialist looking for module information."""
         # User searches for specific module
-        results = search_help(help_server, query="X20DI9371")
+        results = await search_help(help_server, query="X20DI9371")
         assert results.total > 0
 
         # User selects top result and reads full documentation
-        page = get_page_by_id(page_id=results.results[0].page_id, ctx=help_server)
+        page = await get_page_by_id(page_id=results.results[0].page_id, ctx=help_server)
         assert page is not None
         assert "Digital input module" in page.plain_text
 
@@ -199,7 +205,8 @@ class TestCompleteUserJourneys:
         assert page.online_help_url is not None
         assert "hardware" in page.online_help_url.lower()
 
-    def test_motion_engineer_journey(self, help_server):
+    @pytest.mark.asyncio
+    async def test_motion_engineer_journey(self, help_server):
         """Simulate a motion engineer looking for function block docs."""
         # User browses categories
         categories = get_categories(help_server)
@@ -219,18 +226,19 @@ class TestCompleteUserJourneys:
         assert mapp_children is not None
 
         # User searches for specific FB
-        results = search_help(help_server, query="MC_BR_MoveAbsolute", category="Motion")
+        results = await search_help(help_server, query="MC_BR_MoveAbsolute", category="Motion")
         assert results.total > 0
 
         # User reads documentation
-        page = get_page_by_id(page_id=results.results[0].page_id, ctx=help_server)
+        page = await get_page_by_id(page_id=results.results[0].page_id, ctx=help_server)
         assert page is not None
         assert "absolute position" in page.plain_text.lower()
 
-    def test_help_context_lookup_journey(self, help_server):
+    @pytest.mark.asyncio
+    async def test_help_context_lookup_journey(self, help_server):
         """Simulate context-sensitive help lookup via HelpID."""
         # Application calls help with HelpID (from F1 key press)
-        page = get_page_by_help_id(help_server, help_id="12345")
+        page = await get_page_by_help_id(help_server, help_id="12345")
         assert page is not None
         assert page.title == "X20DI9371"
 
@@ -238,18 +246,19 @@ class TestCompleteUserJourneys:
         assert len(page.breadcrumb) > 0
         assert page.breadcrumb[0] == "Hardware"
 
-    def test_search_refinement_journey(self, help_server):
+    @pytest.mark.asyncio
+    async def test_search_refinement_journey(self, help_server):
         """Simulate user refining search with different keywords."""
         # Initial broad search
-        results1 = search_help(help_server, query="motion")
+        results1 = await search_help(help_server, query="motion")
         initial_count = results1.total
 
         # Refine with more specific term
-        results2 = search_help(help_server, query="move absolute")
+        results2 = await search_help(help_server, query="move absolute")
         assert results2.total <= initial_count
 
         # Further refine with category
-        results3 = search_help(help_server, query="move", category="Motion")
+        results3 = await search_help(help_server, query="move", category="Motion")
         assert results3.total > 0
 
         # All results should be from Motion category
@@ -284,14 +293,16 @@ class TestErrorRecovery:
 
         search_engine.close()
 
-    def test_nonexistent_page_id(self, help_server):
+    @pytest.mark.asyncio
+    async def test_nonexistent_page_id(self, help_server):
         """Test handling of non-existent page ID."""
-        page = get_page_by_id(page_id="nonexistent_id", ctx=help_server)
+        page = await get_page_by_id(page_id="nonexistent_id", ctx=help_server)
         assert page is None
 
-    def test_nonexistent_help_id(self, help_server):
+    @pytest.mark.asyncio
+    async def test_nonexistent_help_id(self, help_server):
         """Test handling of non-existent HelpID."""
-        page = get_page_by_help_id(help_server, help_id="99999")
+        page = await get_page_by_help_id(help_server, help_id="99999")
         assert page is None
 
     def test_nonexistent_section_id(self, help_server):
@@ -299,15 +310,17 @@ class TestErrorRecovery:
         children = browse_section(help_server, section_id="nonexistent_section")
         assert children is None
 
-    def test_empty_search_query(self, help_server):
+    @pytest.mark.asyncio
+    async def test_empty_search_query(self, help_server):
         """Test handling of empty search query."""
-        results = search_help(help_server, query="")
+        results = await search_help(help_server, query="")
         assert results.total == 0
         assert len(results.results) == 0
 
-    def test_search_no_results(self, help_server):
+    @pytest.mark.asyncio
+    async def test_search_no_results(self, help_server):
         """Test handling of search with no results."""
-        results = search_help(help_server, query="zzzznonexistentzzzzz")
+        results = await search_help(help_server, query="zzzznonexistentzzzzz")
         # With hybrid search, vector similarity may still return low-relevance
         # candidates even for nonsensical queries. Verify scores are very low.
         for result in results.results:
@@ -341,43 +354,46 @@ class TestDataConsistency:
 
         search_engine.close()
 
-    def test_page_id_consistency(self, help_server):
+    @pytest.mark.asyncio
+    async def test_page_id_consistency(self, help_server):
         """Verify page_id is consistent across search and retrieval."""
         # Search for page
-        results = search_help(help_server, query="X20DI9371")
+        results = await search_help(help_server, query="X20DI9371")
         assert results.total > 0
 
         page_id = results.results[0].page_id
 
         # Retrieve by page_id
-        page = get_page_by_id(page_id=page_id, ctx=help_server)
+        page = await get_page_by_id(page_id=page_id, ctx=help_server)
         assert page is not None
         assert page.page_id == page_id
 
-    def test_help_id_consistency(self, help_server):
+    @pytest.mark.asyncio
+    async def test_help_id_consistency(self, help_server):
         """Verify HelpID is consistent across operations."""
         # Get page by HelpID
-        page_by_help_id = get_page_by_help_id(help_server, help_id="12345")
+        page_by_help_id = await get_page_by_help_id(help_server, help_id="12345")
         assert page_by_help_id is not None
 
         # Get same page by page_id
-        page_by_id = get_page_by_id(page_id=page_by_help_id.page_id, ctx=help_server)
+        page_by_id = await get_page_by_id(page_id=page_by_help_id.page_id, ctx=help_server)
         assert page_by_id is not None
 
         # Should be same page
         assert page_by_help_id.title == page_by_id.title
         assert page_by_help_id.help_id == page_by_id.help_id
 
-    def test_breadcrumb_consistency(self, help_server):
+    @pytest.mark.asyncio
+    async def test_breadcrumb_consistency(self, help_server):
         """Verify breadcrumb is consistent across search and page retrieval."""
         # Search for deeply nested page
-        results = search_help(help_server, query="MC_BR_MoveAbsolute")
+        results = await search_help(help_server, query="MC_BR_MoveAbsolute")
         assert results.total > 0
 
         search_breadcrumb = results.results[0].breadcrumb_path
 
         # Get full page
-        page = get_page_by_id(page_id=results.results[0].page_id, include_breadcrumb=True, ctx=help_server)
+        page = await get_page_by_id(page_id=results.results[0].page_id, include_breadcrumb=True, ctx=help_server)
         page_breadcrumb = " > ".join(page.breadcrumb)
 
         # Should match
@@ -445,17 +461,19 @@ class TestLargeDataset:
 
         search_engine.close()
 
-    def test_large_dataset_search(self, large_help_server):
+    @pytest.mark.asyncio
+    async def test_large_dataset_search(self, large_help_server):
         """Test search performance with larger dataset."""
-        results = search_help(large_help_server, query="Page")
+        results = await search_help(large_help_server, query="Page")
 
         # Should find many pages
         assert results.total > 0
 
-    def test_large_dataset_pagination(self, large_help_server):
+    @pytest.mark.asyncio
+    async def test_large_dataset_pagination(self, large_help_server):
         """Test search with different limits."""
-        results_5 = search_help(large_help_server, query="Page", limit=5)
-        results_10 = search_help(large_help_server, query="Page", limit=10)
+        results_5 = await search_help(large_help_server, query="Page", limit=5)
+        results_10 = await search_help(large_help_server, query="Page", limit=10)
 
         assert len(results_5.results) <= 5
         assert len(results_10.results) <= 10
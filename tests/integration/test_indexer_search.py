@@ -143,7 +143,8 @@ class TestMCPToolIntegration:
 
         search_engine.close()
 
-    def test_search_then_get_page_workflow(self, app_context):
+    @pytest.mark.asyncio
+    async def test_search_then_get_page_workflow(self, app_context):
         """Verify search_help -> get_page_by_id workflow."""
         from unittest.mock import MagicMock
 
@@ -154,13 +155,13 @@ class TestMCPToolIntegration:
         ctx.request_context.lifespan_context = app_context
 
         # Search for a page
-        search_results = search_help(ctx, query="X20DI9371")
+        search_results = await search_help(ctx, query="X20DI9371")
 
         assert search_results.total > 0
         page_id = search_results.results[0].page_id
 
         # Get full page content
-        page_content = get_page_by_id(page_id=page_id, ctx=ctx)
+        page_content = await get_page_by_id(page_id=page_id, ctx=ctx)
 
         assert page_content is not None
         assert page_content.title == "X20DI9371"
@@ -189,7 +190,8 @@ class TestMCPToolIntegration:
         assert children is not None
         assert children.total > 0
 
-    def test_search_with_category_filter(self, app_context):
+    @pytest.mark.asyncio
+    async def test_search_with_category_filter(self, app_context):
         """Verify category filter from get_categories works in search_help."""
         from unittest.mock import MagicMock
 
@@ -203,7 +205,7 @@ class TestMCPToolIntegration:
         hardware_cat = next((c for c in categories.categories if c.title == "Hardware"), None)
         assert hardware_cat is not None
 
-        results = search_help(ctx, query="X20", category="Hardware")
+        results = await search_help(ctx, query="X20", category="Hardware")
 
         # All results should be from Hardware category
         for result in results.results:
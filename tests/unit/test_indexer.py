@@ -1,6 +1,12 @@
 """Unit tests for indexer.py - XML parsing and breadcrumb logic."""
 
+import hashlib
 import json
+import os
+from unittest.mock import patch
+
+import pytest
+from lxml import etree
 
 from src.indexer import HelpContentIndexer
 
@@ -57,6 +63,29 @@ class TestXMLAttributeExtraction:
         assert page.file_path == "hardware/x20di9371.html"
         assert page.is_section is False
 
+    def test_defusedxml_parser_matches_lxml(self, temp_help_dir, sample_xml):
+        """Verify trusted_xml=False (defusedxml) yields the same structure as lxml."""
+        lxml_indexer = HelpContentIndexer(temp_help_dir)
+        lxml_indexer.parse_xml_structure()
+        defused_indexer = HelpContentIndexer(temp_help_dir, trusted_xml=False)
+        defused_indexer.parse_xml_structure()
+
+        assert lxml_indexer.pages == defused_indexer.pages
+        assert lxml_indexer.help_id_map == defused_indexer.help_id_map
+
+    def test_entity_expansion_rejected(self, temp_help_dir):
+        """Verify the lxml parser refuses billion-laughs style entity expansion."""
+        entities = '<!ENTITY l0 "lollollol">' + "".join(f'<!ENTITY l{i} "{f"&l{i - 1};" * 10}">' for i in range(1, 10))
+        xml_content = f"""<?xml version="1.0"?>
+<!DOCTYPE BrHelpContent [{entities}]>
+<BrHelpContent><Page Id="p1" Text="&l9;" File="p1.html"/></BrHelpContent>
+"""
+        (temp_help_dir / "brhelpcontent.xml").write_text(xml_content, encoding="utf-8")
+
+        indexer = HelpContentIndexer(temp_help_dir)
+        with pytest.raises(etree.XMLSyntaxError, match="amplification"):
+            indexer.parse_xml_structure()
+
 
 class TestHelpIDExtraction:
     """Test HelpID extraction from XML."""
@@ -210,6 +239,17 @@ class TestBreadcrumbComputation:
         assert len(breadcrumb) == 1
         assert breadcrumb[0].text == "Orphan Page"
 
+    def test_breadcrumb_reuses_parent_breadcrumb(self, temp_help_dir, sample_xml):
+        """Verify a page's breadcrumb extends its parent's cached breadcrumb."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        page_crumb = indexer.get_breadcrumb("mc_moveabs_page")
+        parent_crumb = indexer.get_breadcrumb(indexer.pages["mc_moveabs_page"].parent_id)
+
+        assert page_crumb[:-1] == parent_crumb
+        assert page_crumb[-1] is indexer.pages["mc_moveabs_page"]
+
     def test_breadcrumb_string_format(self, temp_help_dir, sample_xml):
         """Verify get_breadcrumb_string returns ' > ' separated path."""
         indexer = HelpContentIndexer(temp_help_dir)
@@ -218,6 +258,17 @@ class TestBreadcrumbComputation:
         breadcrumb_str = indexer.get_breadcrumb_string("mc_moveabs_page")
         assert breadcrumb_str == "Motion > mapp Motion > MC_BR_MoveAbsolute"
 
+    def test_breadcrumb_string_matches_breadcrumb_for_all_pages(self, temp_help_dir, sample_xml):
+        """Verify the precomputed breadcrumb strings agree with the breadcrumb pages."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        for page_id in indexer.pages:
+            expected = " > ".join(p.text for p in indexer.get_breadcrumb(page_id))
+            assert indexer.get_breadcrumb_string(page_id) == expected
+
+        assert indexer.get_breadcrumb_string("nonexistent") == ""
+
 
 class TestCategoryAndChildrenFunctions:
     """Test category and children retrieval functions."""
@@ -270,6 +321,20 @@ class TestCategoryAndChildrenFunctions:
         children = indexer.get_section_children("nonexistent")
         assert children == []
 
+    def test_get_structure_stats_matches_pages(self, temp_help_dir, sample_xml):
+        """Verify precomputed statistics agree with a direct count over pages."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        pages = indexer.pages.values()
+        stats = indexer.get_structure_stats()
+        assert stats["total_pages"] == len(indexer.pages)
+        assert stats["total_sections"] == sum(p.is_section for p in pages)
+        assert stats["regular_pages"] == stats["total_pages"] - stats["total_sections"]
+        assert stats["help_id_mappings"] == len(indexer.help_id_map)
+        assert stats["root_items"] == sum(p.parent_id is None for p in pages)
+        assert stats["pages_with_parents"] == stats["total_pages"] - stats["root_items"]
+
 
 class TestDuplicateIDHandling:
     """Test duplicate ID detection and handling."""
@@ -303,6 +368,25 @@ class TestDuplicateIDHandling:
         assert indexer.pages["dup_id__dup_1"].text == "Second Instance"
         assert indexer.pages["dup_id__dup_1"].file_path == "second.html"
 
+    def test_duplicate_id_numbering(self, temp_help_dir):
+        """Verify each further duplicate gets the next synthetic ID."""
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<BrHelpContent>
+    <Section Id="dup_id" Text="First" File="first.html"/>
+    <Section Id="dup_id" Text="Second" File="second.html"/>
+    <Section Id="dup_id" Text="Third" File="third.html"/>
+</BrHelpContent>
+"""
+        xml_path = temp_help_dir / "brhelpcontent.xml"
+        xml_path.write_text(xml_content, encoding="utf-8")
+
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        assert indexer._duplicate_ids["dup_id"] == ["First", "Second", "Third"]
+        assert indexer.pages["dup_id__dup_1"].text == "Second"
+        assert indexer.pages["dup_id__dup_2"].text == "Third"
+
     def test_duplicate_id_does_not_crash(self, temp_help_dir):
         """Verify parsing continues when duplicate IDs encountered, children get correct parents."""
         xml_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -433,6 +517,36 @@ class TestMetadataOperations:
         indexer2 = HelpContentIndexer(temp_help_dir)
         assert indexer2.needs_reindex() is True
 
+    def test_needs_reindex_stat_match_skips_hash(self, temp_help_dir, sample_xml):
+        """Verify needs_reindex does not hash the XML when mtime and size match."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        indexer2 = HelpContentIndexer(temp_help_dir)
+        with patch.object(indexer2, "_get_xml_hash", side_effect=AssertionError("hash computed")):
+            assert indexer2.needs_reindex() is False
+
+    def test_needs_reindex_touched_file_falls_back_to_hash(self, temp_help_dir, sample_xml):
+        """Verify a changed mtime with identical content is still treated as unchanged."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        xml_path = temp_help_dir / "brhelpcontent.xml"
+        stat = xml_path.stat()
+        os.utime(xml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        indexer2 = HelpContentIndexer(temp_help_dir)
+        assert indexer2.needs_reindex() is False
+        indexer2.parse_xml_structure()
+
+        # The new stat was recorded, so the next start trusts it without hashing
+        indexer3 = HelpContentIndexer(temp_help_dir)
+        with patch.object(indexer3, "_get_xml_hash", wraps=indexer3._get_xml_hash) as mock_hash:
+            assert indexer3.needs_reindex() is False
+            indexer3.parse_xml_structure()
+        mock_hash.assert_not_called()
+        assert len(indexer3.pages) == len(indexer.pages)
+
     def test_save_metadata_content(self, temp_help_dir, sample_xml):
         """Verify _save_metadata writes correct JSON structure."""
         indexer = HelpContentIndexer(temp_help_dir)
@@ -448,6 +562,8 @@ class TestMetadataOperations:
         assert "indexed_at" in metadata
         assert "page_count" in metadata
         assert "help_id_count" in metadata
+        assert "xml_mtime_ns" in metadata
+        assert "xml_size" in metadata
         assert metadata["page_count"] > 0
         assert metadata["help_id_count"] > 0
 
@@ -460,7 +576,61 @@ class TestMetadataOperations:
 
         assert hash1 == hash2
         assert isinstance(hash1, str)
-        assert len(hash1) == 32  # MD5 hash length
+        assert len(hash1) == 32  # 16-byte BLAKE2b digest
+
+    def test_get_xml_hash_uses_blake2b(self, temp_help_dir, sample_xml):
+        """Verify _get_xml_hash streams the file into BLAKE2b."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        expected = hashlib.blake2b(indexer.xml_path.read_bytes(), digest_size=16).hexdigest()
+
+        assert indexer._get_xml_hash() == expected
+
+    def test_get_xml_hash_memoized_until_file_changes(self, temp_help_dir, sample_xml):
+        """Verify _get_xml_hash reuses its result while mtime and size are unchanged."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        first = indexer._get_xml_hash()
+
+        with patch.object(type(indexer.xml_path), "open", side_effect=AssertionError("file re-read")):
+            assert indexer._get_xml_hash() == first
+
+        indexer.xml_path.write_text(indexer.xml_path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        assert indexer._get_xml_hash() != first
+
+    def test_index_cache_skips_parsing(self, temp_help_dir, sample_xml):
+        """Verify a second indexer loads the pickled structure instead of parsing."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+        assert indexer.index_cache_path.exists()
+
+        cached = HelpContentIndexer(temp_help_dir)
+        with patch.object(cached, "_iterparse", side_effect=AssertionError("XML parsed")):
+            cached.parse_xml_structure()
+
+        assert cached.pages == indexer.pages
+        assert cached.help_id_map == indexer.help_id_map
+        assert cached.get_breadcrumb_string("mc_moveabs_page") == "Motion > mapp Motion > MC_BR_MoveAbsolute"
+        assert cached.get_breadcrumb("mc_moveabs_page")[-1] is cached.pages["mc_moveabs_page"]
+        assert [c["id"] for c in cached.get_section_children("motion_section")] == [
+            c["id"] for c in indexer.get_section_children("motion_section")
+        ]
+        assert cached.get_structure_stats() == indexer.get_structure_stats()
+
+    def test_index_cache_ignored_after_xml_change(self, temp_help_dir, sample_xml):
+        """Verify the index cache is not used once brhelpcontent.xml changes."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<BrHelpContent>
+    <Page Id="new_page" Text="New" File="new.html"/>
+</BrHelpContent>
+"""
+        (temp_help_dir / "brhelpcontent.xml").write_text(xml_content, encoding="utf-8")
+
+        reparsed = HelpContentIndexer(temp_help_dir)
+        reparsed.parse_xml_structure()
+
+        assert list(reparsed.pages) == ["new_page"]
 
 
 class TestContentExtraction:
@@ -508,6 +678,32 @@ class TestContentExtraction:
         assert "<" not in text
         assert ">" not in text
 
+    def test_extract_plain_text_served_from_cache(self, temp_help_dir, sample_xml):
+        """Verify repeated retrievals reuse the cached text and HTML instead of re-reading the file."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        text = indexer.extract_plain_text("x20di9371_page")
+        html = indexer.extract_html_content("x20di9371_page")
+        with patch("builtins.open", side_effect=AssertionError("file re-read")):
+            assert indexer.extract_plain_text("x20di9371_page") == text
+            assert indexer.extract_html_content("x20di9371_page") == html
+
+        info = indexer.content_cache_info()
+        assert info["plain_text"]["hits"] == 1 and info["plain_text"]["misses"] == 1
+        assert info["html"]["hits"] == 1 and info["html"]["misses"] == 1
+
+    def test_content_cache_is_bounded(self, temp_help_dir, sample_xml):
+        """Verify the least recently used page is evicted once the cache is full."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+        indexer._text_cache.maxsize = 2
+
+        for page_id in ("x20di9371_page", "mc_moveabs_page", "hardware_section"):
+            indexer.extract_plain_text(page_id)
+
+        assert list(indexer._text_cache._data) == ["mc_moveabs_page", "hardware_section"]
+
     def test_extract_plain_text_removes_script_style(self, temp_help_dir):
         """Verify script and style tags are removed."""
         # Create HTML with script/style
@@ -543,6 +739,23 @@ class TestContentExtraction:
         assert "Title" in text
         assert "Content" in text
 
+    def test_extract_plain_text_separates_block_elements(self, temp_help_dir):
+        """Verify adjacent block elements don't merge words and comments are skipped."""
+        html_content = "<html><body><div><h1>Title</h1><p>First</p><p>Second</p></div><!-- hidden --></body></html>"
+        (temp_help_dir / "blocks.html").write_text(html_content, encoding="utf-8")
+
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<BrHelpContent>
+    <Page Id="blocks_page" Text="Blocks" File="blocks.html"/>
+</BrHelpContent>
+"""
+        (temp_help_dir / "brhelpcontent.xml").write_text(xml_content, encoding="utf-8")
+
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        assert indexer.extract_plain_text("blocks_page") == "Title First Second"
+
     def test_extract_text_for_page_no_cache(self, temp_help_dir, sample_xml):
         """Verify _extract_plain_text_no_cache doesn't store state on the page."""
         indexer = HelpContentIndexer(temp_help_dir)
@@ -559,6 +772,14 @@ class TestContentExtraction:
         assert not hasattr(page, "plain_text")
         assert not hasattr(page, "html_content")
 
+    def test_help_page_uses_slots(self, temp_help_dir, sample_xml):
+        """Verify HelpPage instances have no per-instance __dict__."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        page = indexer.pages["x20di9371_page"]
+        assert not hasattr(page, "__dict__")
+
     def test_extract_content_file_not_found(self, temp_help_dir):
         """Verify graceful handling of missing HTML files."""
         xml_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -578,6 +799,17 @@ class TestContentExtraction:
         text = indexer.extract_plain_text("missing_page")
         assert text is None
 
+    def test_bulk_extract_plain_text_matches_single_page(self, temp_help_dir, sample_xml):
+        """Verify parallel bulk extraction yields the same text as extract_plain_text."""
+        indexer = HelpContentIndexer(temp_help_dir)
+        indexer.parse_xml_structure()
+
+        results = dict(indexer.bulk_extract_plain_text(max_workers=1))
+
+        assert set(results) == set(indexer.pages)
+        for page_id, text in results.items():
+            assert text == indexer.extract_plain_text(page_id)
+
 
 class TestPageRetrieval:
     """Test page retrieval methods."""
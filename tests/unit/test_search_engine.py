@@ -1,10 +1,14 @@
 """Unit tests for search_engine.py - LanceDB hybrid search with RRF."""
 
+import gc
 import json
+import threading
 from unittest.mock import MagicMock, patch
 
+import lancedb
 import pytest
 
+from src.indexer import HelpContentIndexer
 from src.search_engine import HelpSearchEngine, _is_identifier_query
 
 
@@ -165,6 +169,19 @@ class TestResultMapping:
             assert "score" in result
             assert "snippet" in result
 
+    def test_raw_search_rows_skip_index_only_columns(self, search_engine_with_data):
+        """Verify FTS and vector rows don't read search_text or vector columns."""
+        engine = search_engine_with_data
+        table = engine.db.open_table(engine.TABLE_NAME)
+
+        fts_rows = engine._fts_search(table, "motion", 10, None)
+        vector_rows = engine._vector_search(table, [0.1] * engine.embedder.dimension, "title_vector", 10, None)
+
+        assert fts_rows and vector_rows
+        for row in fts_rows + vector_rows:
+            assert set(engine._RESULT_COLUMNS) <= row.keys()
+            assert not {"search_text", "title_vector", "content_vector"} & row.keys()
+
     def test_search_score_is_positive(self, search_engine_with_data):
         """Verify RRF score is positive."""
         results = search_engine_with_data.search("motion")
@@ -203,8 +220,8 @@ class TestErrorHandling:
         assert isinstance(results, list)
 
 
-class TestExtractTextForPage:
-    """Test _extract_text_for_page helper method."""
+class TestExtractRecords:
+    """Test _extract_records index record building."""
 
     @pytest.fixture
     def search_engine_with_data(self, initialized_indexer, tmp_path, mock_embedding_service):
@@ -217,34 +234,34 @@ class TestExtractTextForPage:
         yield engine
         engine.close()
 
-    def test_extract_text_for_page_section(self, search_engine_with_data):
+    def test_extract_records_section(self, search_engine_with_data):
         """Verify sections with HTML files get their content extracted."""
         section_id = "hardware_section"
         page = search_engine_with_data.indexer.pages[section_id]
 
-        result = search_engine_with_data._extract_text_for_page(section_id, page)
+        result = search_engine_with_data._extract_records([(section_id, page)])[0]
 
         # Sections now get content extracted from their HTML file
         assert isinstance(result[2], str)  # content is 3rd element
         # hardware_section points to index.html which has "Welcome" / "This is the index page"
         assert len(result[2]) > 0
 
-    def test_extract_text_for_page_category_extraction(self, search_engine_with_data):
+    def test_extract_records_category_extraction(self, search_engine_with_data):
         """Verify category is extracted from first breadcrumb item."""
         page_id = "x20di9371_page"
         page = search_engine_with_data.indexer.pages[page_id]
 
-        result = search_engine_with_data._extract_text_for_page(page_id, page)
+        result = search_engine_with_data._extract_records([(page_id, page)])[0]
 
         category = result[7]  # category is 8th element
         assert category == "Hardware"
 
-    def test_extract_text_for_page_tuple_structure(self, search_engine_with_data):
+    def test_extract_records_tuple_structure(self, search_engine_with_data):
         """Verify return tuple has 8 elements in correct order."""
         page_id = "x20di9371_page"
         page = search_engine_with_data.indexer.pages[page_id]
 
-        result = search_engine_with_data._extract_text_for_page(page_id, page)
+        result = search_engine_with_data._extract_records([(page_id, page)])[0]
 
         assert len(result) == 8
 
@@ -346,6 +363,19 @@ class TestIndexBuildAndLoad:
 
         engine2.close()
 
+    def test_load_index_prewarms_indexes(self, initialized_indexer, tmp_path):
+        """Verify a warm start loads the FTS and category indexes into the cache."""
+        db_path = tmp_path / "test_lance"
+        HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True).initialize().close()
+
+        engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=False)
+        with patch("lancedb.table.LanceTable.prewarm_index", autospec=True) as mock_prewarm:
+            engine.initialize()
+
+        prewarmed = {call.args[1] for call in mock_prewarm.call_args_list}
+        assert prewarmed == {"search_text_idx", "category_lc_idx"}
+        engine.close()
+
 
 class TestSnippetGeneration:
     """Test snippet generation from content."""
@@ -379,30 +409,42 @@ class TestSnippetGeneration:
 class TestParallelProcessing:
     """Test parallel text extraction during indexing."""
 
-    def test_build_index_uses_multiple_threads(self, initialized_indexer, tmp_path, mock_embedding_service):
-        """Verify index build uses ThreadPoolExecutor."""
+    def test_build_index_extracts_text_in_one_process_pool(self, initialized_indexer, tmp_path):
+        """Verify text extraction runs on a single process pool that is shut down after the build."""
         db_path = tmp_path / "test_lance"
 
-        with patch("src.search_engine.ThreadPoolExecutor") as mock_executor:
-            # Create mock executor context manager
-            mock_executor_instance = MagicMock()
-            mock_executor.return_value.__enter__.return_value = mock_executor_instance
+        with (
+            patch("src.search_engine.SERIAL_EXTRACTION_THRESHOLD", 0),
+            patch.object(
+                HelpContentIndexer, "create_extraction_pool", wraps=HelpContentIndexer.create_extraction_pool
+            ) as mock_pool,
+        ):
+            engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+            engine.initialize()
 
-            # Mock the map method to return empty results
-            mock_executor_instance.map.return_value = []
+        try:
+            assert mock_pool.call_count == 1
+            assert engine._extraction_pool is None
+            table = engine.db.open_table(engine.TABLE_NAME)
+            rows = {row["page_id"]: row for row in table.to_arrow().to_pylist()}
+            for page_id, page in initialized_indexer.pages.items():
+                assert rows[page_id]["content"] == (initialized_indexer._extract_plain_text_no_cache(page) or "")
+        finally:
+            engine.close()
+
+    def test_small_build_extracts_text_without_process_pool(self, initialized_indexer, tmp_path):
+        """Verify a build below the serial threshold parses inline and never spawns workers."""
+        db_path = tmp_path / "test_lance"
 
-            try:
-                engine = HelpSearchEngine(
-                    db_path, initialized_indexer, force_rebuild=True, embedding_service=mock_embedding_service
-                )
-                engine.initialize()
-                engine.close()
-            except Exception:
-                # Expected to fail due to mocking, but ThreadPoolExecutor should have been called
-                pass
+        with patch.object(HelpContentIndexer, "create_extraction_pool") as mock_pool:
+            engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+            engine.initialize()
 
-            # Verify ThreadPoolExecutor was created
-            assert mock_executor.called
+        try:
+            mock_pool.assert_not_called()
+            assert len(engine.search("motion")) > 0
+        finally:
+            engine.close()
 
 
 class TestDatabaseConnection:
@@ -420,6 +462,145 @@ class TestDatabaseConnection:
             results = engine.search("motion")
             assert isinstance(results, list)
 
+    def test_search_reuses_table_handle_once_ready(self, initialized_indexer, tmp_path):
+        """Verify search opens the table once after the build and close() drops the handle."""
+        db_path = tmp_path / "test_lance"
+        engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+        engine.initialize()
+        # Let the post-build optimize commit first; it would otherwise trigger one reopen
+        engine._optimize_thread.join()
+
+        with patch.object(engine.db, "open_table", wraps=engine.db.open_table) as mock_open:
+            engine.search("motion")
+            engine.search("motion", limit=3)
+
+        assert mock_open.call_count == 1
+
+        engine.close()
+        assert engine._search_table is None
+
+    def test_repeated_search_served_from_result_cache(self, initialized_indexer, tmp_path):
+        """Verify an identical search skips the table, while other parameters still query it."""
+        db_path = tmp_path / "test_lance"
+        engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+        engine.initialize()
+
+        first = engine.search("motion")
+        with patch.object(engine, "_fts_search", wraps=engine._fts_search) as mock_fts:
+            second = engine.search("  motion ")
+            assert mock_fts.call_count == 0
+            engine.search("motion", category="Hardware")
+            assert mock_fts.call_count == 1
+
+        assert second == first
+        assert second is not first
+        engine.close()
+
+    def test_result_cache_hits_are_isolated_from_caller_mutation(self, initialized_indexer, tmp_path):
+        """Verify editing a returned result does not change later cache hits for the same query."""
+        db_path = tmp_path / "test_lance"
+        engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+        engine.initialize()
+
+        first = engine.search("motion")
+        expected = [dict(r) for r in first]
+        first[0]["snippet"] = "changed"
+        first[0]["score"] = -1.0
+
+        second = engine.search("motion")
+        assert second == expected
+        second[0]["title"] = "changed"
+
+        assert engine.search("motion") == expected
+        engine.close()
+
+    def test_build_compacts_table_in_background(self, initialized_indexer, tmp_path):
+        """Verify a chunked build is compacted after it is ready, searches read it, and close() waits for it."""
+        db_path = tmp_path / "test_lance"
+
+        with patch("src.search_engine.BUILD_CHUNK_SIZE", 2):
+            engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+            engine.initialize()
+        assert engine._optimize_thread is not None
+
+        engine._optimize_thread.join()
+        assert engine.search("motion")
+        assert engine._search_table.stats()["fragment_stats"]["num_fragments"] == 1
+
+        engine.close()
+        assert engine._optimize_thread is None
+
+        db = lancedb.connect(str(db_path))
+        stats = db.open_table(HelpSearchEngine.TABLE_NAME).stats()
+        assert stats["fragment_stats"]["num_fragments"] == 1
+
+    def test_search_switches_to_optimized_table_version(self, initialized_indexer, tmp_path):
+        """Verify the pinned search handle moves to the compacted version once the optimize commits."""
+        db_path = tmp_path / "test_lance"
+        optimize_table = HelpSearchEngine._optimize_table
+        release = threading.Event()
+
+        def gated_optimize(db, name, done):
+            release.wait(5)
+            optimize_table(db, name, done)
+
+        with (
+            patch("src.search_engine.BUILD_CHUNK_SIZE", 2),
+            patch.object(HelpSearchEngine, "_optimize_table", staticmethod(gated_optimize)),
+        ):
+            engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+            engine.initialize()
+            engine.search("motion")
+            pinned_version = engine._search_table.version
+
+            release.set()
+            engine._optimize_thread.join()
+
+        assert engine.search("hardware")
+        latest = lancedb.connect(str(db_path)).open_table(HelpSearchEngine.TABLE_NAME)
+        assert engine._search_table.version == latest.version
+        assert engine._search_table.version > pinned_version
+        assert engine._search_table.stats()["fragment_stats"]["num_fragments"] == 1
+        engine.close()
+
+    def test_close_does_not_wait_for_slow_optimize(self, initialized_indexer, tmp_path, caplog):
+        """Verify close() gives up on a long-running optimize after the join timeout."""
+        db_path = tmp_path / "test_lance"
+        release = threading.Event()
+
+        with (
+            patch.object(HelpSearchEngine, "_optimize_table", staticmethod(lambda db, name, done: release.wait(5))),
+            patch("src.search_engine.OPTIMIZE_JOIN_TIMEOUT", 0.05),
+        ):
+            engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+            engine.initialize()
+            thread = engine._optimize_thread
+            engine.close()
+
+        assert thread.is_alive()
+        assert engine._optimize_thread is None
+        assert "still running" in caplog.text
+        release.set()
+        thread.join()
+
+    def test_unclosed_engine_collected_while_optimize_runs(self, initialized_indexer, tmp_path):
+        """Verify the optimize thread does not keep an unclosed engine (and its lock) alive."""
+        db_path = tmp_path / "test_lance"
+        release = threading.Event()
+
+        with patch.object(HelpSearchEngine, "_optimize_table", staticmethod(lambda db, name, done: release.wait(5))):
+            engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+            engine.initialize()
+            thread = engine._optimize_thread
+
+            del engine
+            gc.collect()
+
+            assert thread.is_alive()
+            assert not (db_path / "_instance.lock").exists()
+            release.set()
+            thread.join()
+
     def test_close_method_works(self, initialized_indexer, tmp_path, mock_embedding_service):
         """Verify close method closes connection."""
         db_path = tmp_path / "test_lance"
@@ -433,15 +614,23 @@ class TestDatabaseConnection:
         # Calling close again should not raise exception
         engine.close()
 
-    def test_del_cleanup(self, initialized_indexer, tmp_path, mock_embedding_service):
-        """Verify __del__ cleans up connection."""
+    def test_unclosed_engine_released_when_collected(self, initialized_indexer, tmp_path, mock_embedding_service):
+        """Verify an engine dropped without close() still frees its lock and embedding client."""
         db_path = tmp_path / "test_lance"
+        mock_embedding_service.close = MagicMock()
         engine = HelpSearchEngine(
             db_path, initialized_indexer, force_rebuild=True, embedding_service=mock_embedding_service
         )
         engine.initialize()
+        engine._optimize_thread.join()
 
-        engine.__del__()
+        del engine
+        gc.collect()
+
+        assert not (db_path / "_instance.lock").exists()
+        mock_embedding_service.close.assert_called_once()
+        # The in-process path registry was cleared too, so the database can be reopened
+        HelpSearchEngine(db_path, initialized_indexer).close()
 
 
 class TestSearchLimits:
@@ -466,6 +655,11 @@ class TestSearchLimits:
         results = search_engine_with_data.search("motion", limit=5)
         assert len(results) <= 5
 
+    def test_search_clamps_non_positive_limit(self, search_engine_with_data):
+        """Verify a zero or negative limit is treated as 1 instead of reaching LanceDB."""
+        assert len(search_engine_with_data.search("motion", limit=0)) == 1
+        assert len(search_engine_with_data.search("motion", limit=-5)) == 1
+
 
 class TestPageFingerprinting:
     """Test page fingerprint generation."""
@@ -494,6 +688,24 @@ class TestPageFingerprinting:
         # Other pages unchanged
         assert fps_before["hardware_section"] == fps_after["hardware_section"]
 
+    def test_fingerprint_changes_on_ancestor_rename(self, sample_xml):
+        """Verify descendants get new fingerprints when an ancestor section is renamed."""
+        indexer = HelpContentIndexer(sample_xml.parent)
+        indexer.parse_xml_structure()
+        fps_before = indexer.get_page_fingerprints()
+
+        sample_xml.write_text(
+            sample_xml.read_text(encoding="utf-8").replace('Text="Motion"', 'Text="Motion Control"'),
+            encoding="utf-8",
+        )
+        renamed = HelpContentIndexer(sample_xml.parent)
+        renamed.parse_xml_structure()
+        fps_after = renamed.get_page_fingerprints()
+
+        assert fps_before["mc_moveabs_page"] != fps_after["mc_moveabs_page"]
+        assert fps_before["mapp_motion_section"] != fps_after["mapp_motion_section"]
+        assert fps_before["x20di9371_page"] == fps_after["x20di9371_page"]
+
 
 class TestBuildStrategyDetection:
     """Test _detect_build_strategy logic."""
@@ -520,6 +732,22 @@ class TestBuildStrategyDetection:
         )
         assert engine2._build_strategy == "none"
 
+    def test_full_when_schema_version_changed(self, initialized_indexer, tmp_path):
+        """Verify an index written with an older table layout is rebuilt."""
+        db_path = tmp_path / "test_lance"
+        engine = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=True)
+        engine.initialize()
+        engine.close()
+
+        metadata_path = db_path / "_index_metadata.json"
+        metadata = json.loads(metadata_path.read_text())
+        del metadata["schema_version"]
+        metadata_path.write_text(json.dumps(metadata))
+
+        engine2 = HelpSearchEngine(db_path, initialized_indexer, force_rebuild=False)
+        assert engine2._build_strategy == "full"
+        engine2.close()
+
     def test_incremental_when_xml_changed_with_fingerprints(
         self, initialized_indexer, tmp_path, mock_embedding_service
     ):
@@ -733,7 +961,7 @@ class TestIncrementalUpdate:
         engine.initialize()
         engine.close()
 
-        # Rewrite XML with same content but different whitespace → different MD5 but same fingerprints
+        # Rewrite XML with same content but different whitespace → different hash but same fingerprints
         xml_content2 = """<?xml version="1.0" encoding="UTF-8"?>
 <BrHelpContent>
   <Section Id="sec1" Text="Section" File="index.html">
@@ -813,7 +1041,7 @@ class TestBuildResume:
         # Build one chunk manually (all pages in test data fit in one chunk)
         all_pages = list(engine.indexer.pages.items())
         partial = all_pages[:1]  # Only index the first page
-        records = [engine._extract_text_for_page(pid, page) for pid, page in partial]
+        records = engine._extract_records(partial)
         title_vecs = engine.embedder.embed_batch([r[1] for r in records])
         content_vecs = engine.embedder.embed_batch([r[2] if r[2] else r[1] for r in records])
         chunk_data = engine._records_to_hybrid_arrow(records, title_vecs, content_vecs)
@@ -838,7 +1066,7 @@ class TestBuildResume:
         engine._save_build_progress()
         all_pages = list(engine.indexer.pages.items())
         partial = all_pages[:1]
-        records = [engine._extract_text_for_page(pid, page) for pid, page in partial]
+        records = engine._extract_records(partial)
         title_vecs = engine.embedder.embed_batch([r[1] for r in records])
         content_vecs = engine.embedder.embed_batch([r[2] if r[2] else r[1] for r in records])
         chunk_data = engine._records_to_hybrid_arrow(records, title_vecs, content_vecs)
@@ -871,7 +1099,7 @@ class TestBuildResume:
 
         # Simulate interrupted build
         engine._save_build_progress()
-        records = [engine._extract_text_for_page(pid, page) for pid, page in list(engine.indexer.pages.items())[:1]]
+        records = engine._extract_records(list(engine.indexer.pages.items())[:1])
         title_vecs = engine.embedder.embed_batch([r[1] for r in records])
         content_vecs = engine.embedder.embed_batch([r[2] if r[2] else r[1] for r in records])
         chunk_data = engine._records_to_hybrid_arrow(records, title_vecs, content_vecs)
@@ -896,7 +1124,7 @@ class TestBuildResume:
 
         # Simulate interrupted build
         engine._save_build_progress()
-        records = [engine._extract_text_for_page(pid, page) for pid, page in list(engine.indexer.pages.items())[:1]]
+        records = engine._extract_records(list(engine.indexer.pages.items())[:1])
         title_vecs = engine.embedder.embed_batch([r[1] for r in records])
         content_vecs = engine.embedder.embed_batch([r[2] if r[2] else r[1] for r in records])
         chunk_data = engine._records_to_hybrid_arrow(records, title_vecs, content_vecs)
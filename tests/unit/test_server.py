@@ -1,12 +1,15 @@
 """Unit tests for server.py - MCP tool implementations."""
 
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.server.fastmcp.tools import Tool
 
+from src.indexer import HelpPage
 from src.server import (
-    AppContext,
+    MAX_PAGES_PER_REQUEST,
     _parse_bool_arg,
     browse_section,
     get_as_version_config,
@@ -15,6 +18,7 @@ from src.server import (
     get_help_statistics,
     get_page_by_help_id,
     get_page_by_id,
+    get_pages_by_ids,
     search_help,
 )
 
@@ -72,21 +76,9 @@ class TestBoolArgParsing:
 class TestSearchHelpTool:
     """Test search_help MCP tool."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context with indexer and search engine."""
-        mock_search_engine = MagicMock()
-        mock_search_engine.build_status = {
-            "state": "ready",
-            "build_type": "none",
-            "phase": "complete",
-            "pages_total": 3,
-            "pages_processed": 3,
-            "elapsed_seconds": 0.2,
-            "error": None,
-        }
-
-        # Mock search results
+    @pytest.fixture(autouse=True)
+    def _search_results(self, mock_search_engine):
+        """Return a single regular page from the search engine."""
         mock_search_engine.search.return_value = [
             {
                 "page_id": "page1",
@@ -101,37 +93,27 @@ class TestSearchHelpTool:
             }
         ]
 
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=mock_search_engine,
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        # Create mock MCP context
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-
-        return ctx
-
-    def test_search_help_truncates_preview(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_search_help_truncates_preview(self, mock_context):
         """Verify content_preview is truncated to ~100 chars."""
-        result = search_help(mock_context, query="test")
+        result = await search_help(mock_context, query="test")
 
         assert len(result.results) > 0
         if result.results[0].content_preview:
             assert len(result.results[0].content_preview) < 200
             assert "[TRUNCATED" in result.results[0].content_preview
 
-    def test_search_help_builds_online_url(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_search_help_builds_online_url(self, mock_context):
         """Verify online_help_url is constructed from file_path."""
-        result = search_help(mock_context, query="test")
+        result = await search_help(mock_context, query="test")
 
         assert len(result.results) > 0
         assert result.results[0].online_help_url is not None
         assert "https://help.br-automation.com/#/en/4/test.html" == result.results[0].online_help_url
 
-    def test_search_help_normalizes_path_separators(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_search_help_normalizes_path_separators(self, mock_context):
         """Verify backslashes in file_path are converted to forward slashes."""
         # Modify mock to return backslashes
         mock_context.request_context.lifespan_context.search_engine.search.return_value = [
@@ -148,13 +130,14 @@ class TestSearchHelpTool:
             }
         ]
 
-        result = search_help(mock_context, query="test")
+        result = await search_help(mock_context, query="test")
 
         assert len(result.results) > 0
         assert "motion/axis.html" in result.results[0].online_help_url
         assert "\\" not in result.results[0].online_help_url
 
-    def test_search_help_sections_no_preview(self, mock_context, mock_indexer):
+    @pytest.mark.asyncio
+    async def test_search_help_sections_no_preview(self, mock_context, mock_indexer):
         """Verify sections without snippet have no content_preview."""
         # Mock section result with no snippet
         mock_context.request_context.lifespan_context.search_engine.search.return_value = [
@@ -171,12 +154,13 @@ class TestSearchHelpTool:
             }
         ]
 
-        result = search_help(mock_context, query="test")
+        result = await search_help(mock_context, query="test")
 
         assert len(result.results) > 0
         assert result.results[0].content_preview is None
 
-    def test_search_help_returns_status_while_building(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_search_help_returns_status_while_building(self, mock_context):
         """Verify search returns status message while index build is in progress."""
         mock_engine = mock_context.request_context.lifespan_context.search_engine
         mock_engine.build_status = {
@@ -189,14 +173,15 @@ class TestSearchHelpTool:
             "error": None,
         }
 
-        result = search_help(mock_context, query="test")
+        result = await search_help(mock_context, query="test")
 
         assert result.total == 0
         assert result.status_message is not None
         assert "building" in result.status_message.lower()
         mock_engine.search.assert_not_called()
 
-    def test_search_help_returns_status_on_error(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_search_help_returns_status_on_error(self, mock_context):
         """Verify search returns explicit failure message when index build failed."""
         mock_engine = mock_context.request_context.lifespan_context.search_engine
         mock_engine.build_status = {
@@ -209,7 +194,7 @@ class TestSearchHelpTool:
             "error": "boom",
         }
 
-        result = search_help(mock_context, query="test")
+        result = await search_help(mock_context, query="test")
 
         assert result.total == 0
         assert result.status_message is not None
@@ -221,29 +206,17 @@ class TestSearchHelpTool:
 class TestGetPageByIDTool:
     """Test get_page_by_id MCP tool."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context."""
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=MagicMock(),
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-
-        # Mock content extraction
+    @pytest.fixture(autouse=True)
+    def _page_content(self, mock_indexer):
+        """Mock content extraction."""
         mock_indexer.extract_html_content.return_value = "<html>Test HTML</html>"
         mock_indexer.extract_plain_text.return_value = "Test plain text"
 
-        return ctx
-
-    def test_get_page_by_id_include_flags(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_get_page_by_id_include_flags(self, mock_context):
         """Verify include_html, include_text, include_breadcrumb flags work."""
         # Test with all flags
-        result = get_page_by_id(
+        result = await get_page_by_id(
             page_id="page1", include_html=True, include_text=True, include_breadcrumb=True, ctx=mock_context
         )
 
@@ -252,16 +225,50 @@ class TestGetPageByIDTool:
         assert result.plain_text == "Test plain text"
         assert len(result.breadcrumb) > 0
 
-    def test_get_page_by_id_not_found(self, mock_context, mock_indexer):
+    @pytest.mark.asyncio
+    async def test_get_page_by_id_not_found(self, mock_context, mock_indexer):
         """Verify None returned for non-existent page_id."""
         mock_indexer.get_page_by_id.return_value = None
 
-        result = get_page_by_id(page_id="nonexistent", ctx=mock_context)
+        result = await get_page_by_id(page_id="nonexistent", ctx=mock_context)
         assert result is None
 
-    def test_get_page_by_id_url_building(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_get_pages_by_ids_preserves_order(self, mock_context):
+        """Verify batch retrieval returns pages in request order with None for unknown IDs."""
+        results = await get_pages_by_ids(
+            page_ids=["page2", "missing", "page1"],
+            include_html=False,
+            include_text=True,
+            include_breadcrumb=False,
+            ctx=mock_context,
+        )
+
+        assert [r.page_id if r else None for r in results] == ["page2", None, "page1"]
+        assert results[0].plain_text == "Test plain text"
+        assert results[0].html_content is None
+        assert results[0].breadcrumb == []
+
+    @pytest.mark.asyncio
+    async def test_get_pages_by_ids_validated_through_fastmcp(self, mock_context):
+        """Verify MCP argument validation accepts up to MAX_PAGES_PER_REQUEST IDs and rejects more."""
+        tool = Tool.from_function(get_pages_by_ids)
+
+        page_ids = ["missing0", "page1", "missing2", "missing3", "page2", "missing5", "missing6", "missing7"]
+        page_ids += ["missing8", "section1"]
+        assert len(page_ids) == MAX_PAGES_PER_REQUEST
+        results = await tool.run({"page_ids": page_ids}, context=mock_context)
+        assert [r.page_id if r else None for r in results] == [
+            pid if not pid.startswith("missing") else None for pid in page_ids
+        ]
+
+        with pytest.raises(ToolError, match=f"at most {MAX_PAGES_PER_REQUEST} items"):
+            await tool.run({"page_ids": [*page_ids, "page1"]}, context=mock_context)
+
+    @pytest.mark.asyncio
+    async def test_get_page_by_id_url_building(self, mock_context):
         """Verify online_help_url is correctly built."""
-        result = get_page_by_id(page_id="page1", ctx=mock_context)
+        result = await get_page_by_id(page_id="page1", ctx=mock_context)
 
         assert result is not None
         assert result.online_help_url is not None
@@ -271,65 +278,41 @@ class TestGetPageByIDTool:
 class TestGetPageByHelpIDTool:
     """Test get_page_by_help_id MCP tool."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context."""
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=MagicMock(),
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-
-        # Mock content extraction
+    @pytest.fixture(autouse=True)
+    def _page_content(self, mock_indexer):
+        """Mock content extraction."""
         mock_indexer.extract_html_content.return_value = "<html>Test</html>"
         mock_indexer.extract_plain_text.return_value = "Test"
 
-        return ctx
-
-    def test_get_page_by_help_id_lookup(self, mock_context, mock_indexer):
+    @pytest.mark.asyncio
+    async def test_get_page_by_help_id_lookup(self, mock_context, mock_indexer):
         """Verify HelpID is resolved to page_id via indexer."""
-        result = get_page_by_help_id(mock_context, help_id="12345")
+        result = await get_page_by_help_id(mock_context, help_id="12345")
 
         assert result is not None
         assert result.page_id == "page1"
         assert result.title == "Test Page"
 
-    def test_get_page_by_help_id_not_found(self, mock_context, mock_indexer):
+    @pytest.mark.asyncio
+    async def test_get_page_by_help_id_not_found(self, mock_context, mock_indexer):
         """Verify None returned for non-existent HelpID."""
         mock_indexer.get_page_by_help_id.return_value = None
 
-        result = get_page_by_help_id(mock_context, help_id="99999")
+        result = await get_page_by_help_id(mock_context, help_id="99999")
         assert result is None
 
 
 class TestGetCategoriesTool:
     """Test get_categories MCP tool."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context."""
-        # Mock categories
+    @pytest.fixture(autouse=True)
+    def _categories(self, mock_indexer):
+        """Mock categories."""
         mock_indexer.get_top_level_categories.return_value = [
             {"id": "hardware", "title": "Hardware", "file_path": "hardware.html"},
             {"id": "motion", "title": "Motion", "file_path": "motion.html"},
         ]
 
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=MagicMock(),
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-
-        return ctx
-
     def test_get_categories_returns_all(self, mock_context):
         """Verify all categories are returned."""
         result = get_categories(mock_context)
@@ -343,27 +326,14 @@ class TestGetCategoriesTool:
 class TestBrowseSectionTool:
     """Test browse_section MCP tool."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context."""
-        # Mock section children
+    @pytest.fixture(autouse=True)
+    def _section_children(self, mock_indexer):
+        """Mock section children."""
         mock_indexer.get_section_children.return_value = [
             {"id": "child1", "title": "Child 1", "file_path": "c1.html", "is_section": True},
             {"id": "child2", "title": "Child 2", "file_path": "c2.html", "is_section": False},
         ]
 
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=MagicMock(),
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-
-        return ctx
-
     def test_browse_section_returns_children(self, mock_context):
         """Verify children are returned."""
         result = browse_section(mock_context, section_id="section1")
@@ -385,21 +355,6 @@ class TestBrowseSectionTool:
 class TestGetBreadcrumbTool:
     """Test get_breadcrumb MCP tool."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context."""
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=MagicMock(),
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-
-        return ctx
-
     @pytest.mark.asyncio
     async def test_get_breadcrumb_returns_path(self, mock_context):
         """Verify breadcrumb path is returned."""
@@ -413,35 +368,6 @@ class TestGetBreadcrumbTool:
 class TestGetHelpStatisticsTool:
     """Test get_help_statistics MCP tool."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context."""
-        mock_search_engine = MagicMock()
-        mock_search_engine.build_status = {
-            "state": "ready",
-            "build_type": "none",
-            "phase": "complete",
-            "pages_total": 3,
-            "pages_processed": 3,
-            "elapsed_seconds": 0.5,
-            "incremental_stats": None,
-            "error": None,
-        }
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=mock_search_engine,
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        from unittest.mock import AsyncMock
-
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-        ctx.info = AsyncMock()  # Mock async info method
-
-        return ctx
-
     @pytest.mark.asyncio
     async def test_get_help_statistics_counts(self, mock_context):
         """Verify all statistics are calculated correctly."""
@@ -454,6 +380,7 @@ class TestGetHelpStatisticsTool:
         assert "pages_with_parents" in result
         assert "root_items" in result
         assert "index_status" in result
+        assert "content_cache" in result
 
         assert result["total_pages"] == 3  # from mock_indexer
         assert result["help_id_mappings"] == 1
@@ -461,11 +388,44 @@ class TestGetHelpStatisticsTool:
         assert result["index_status"]["build_type"] == "none"
 
     @pytest.mark.asyncio
-    async def test_get_help_statistics_regular_pages_calculation(self, mock_context):
-        """Verify regular_pages = total_pages - total_sections."""
+    async def test_get_help_statistics_regular_pages_calculation(self, mock_context, mock_indexer):
+        """Verify the counts follow the indexer's pages, with regular_pages = total_pages - total_sections."""
+        mock_indexer.pages["section2"] = HelpPage(
+            id="section2", text="Second Section", file_path="s2.html", is_section=True, parent_id=None
+        )
+        mock_indexer.pages["page3"] = HelpPage(
+            id="page3", text="Third Page", file_path="p3.html", is_section=False, help_id="777", parent_id="section2"
+        )
+        mock_indexer.help_id_map["777"] = "page3"
+
         result = await get_help_statistics(mock_context)
 
+        assert result["total_pages"] == 5
+        assert result["total_sections"] == 2
+        assert result["regular_pages"] == 3
         assert result["regular_pages"] == result["total_pages"] - result["total_sections"]
+        assert result["help_id_mappings"] == 2
+        assert result["pages_with_parents"] == 3
+        assert result["root_items"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_help_statistics_passes_structure_stats_through(self, mock_context, mock_indexer):
+        """Verify the structure counts are exactly what the indexer reports, without recounting."""
+        structure = {
+            "total_pages": 42,
+            "total_sections": 40,
+            "regular_pages": 2,
+            "help_id_mappings": 7,
+            "pages_with_parents": 41,
+            "root_items": 1,
+        }
+        mock_indexer.get_structure_stats.side_effect = None
+        mock_indexer.get_structure_stats.return_value = structure
+
+        result = await get_help_statistics(mock_context)
+
+        mock_indexer.get_structure_stats.assert_called_once_with()
+        assert {key: result[key] for key in structure} == structure
 
 
 class TestURLBuilding:
@@ -493,36 +453,10 @@ class TestURLBuilding:
 class TestSearchResultTransformation:
     """Test search result transformation logic."""
 
-    @pytest.fixture
-    def mock_context(self, mock_indexer):
-        """Create mock context."""
-        mock_search_engine = MagicMock()
-        mock_search_engine.search.return_value = []
-        mock_search_engine.build_status = {
-            "state": "ready",
-            "build_type": "none",
-            "phase": "complete",
-            "pages_total": 3,
-            "pages_processed": 3,
-            "elapsed_seconds": 0.1,
-            "error": None,
-        }
-
-        app_context = AppContext(
-            indexer=mock_indexer,
-            search_engine=mock_search_engine,
-            as_version="4",
-            online_help_base_url="https://help.br-automation.com/#/en/4/",
-        )
-
-        ctx = MagicMock()
-        ctx.request_context.lifespan_context = app_context
-
-        return ctx
-
-    def test_empty_search_results(self, mock_context):
+    @pytest.mark.asyncio
+    async def test_empty_search_results(self, mock_context):
         """Verify empty search returns empty SearchResults."""
-        result = search_help(mock_context, query="nonexistent")
+        result = await search_help(mock_context, query="nonexistent")
 
         assert result.total == 0
         assert len(result.results) == 0